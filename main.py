@@ -11,22 +11,31 @@ warnings.filterwarnings("ignore", category=FutureWarning, module="tree_sitter")
 import os
 import psutil
 import argparse
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 import sys
 import pkgutil
 import importlib
-import inspect
+import functools
 import traceback
 import signal
-from time import sleep
+import hashlib
+import threading
+from uuid import uuid4
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from functools import partial
+from time import sleep, monotonic
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, Iterable, List, Optional, Tuple
 
 from src.mutator              import MutatorGenerator
 from src.mutator              import MutatorValidator 
 from src.mutation_chain       import MutatorChain
 from src.report               import TestReporter
 from src.differential_testing import DifferentialTester
+from src.differential_testing import ResultCache
 import src.utils as utils
 
 
@@ -39,34 +48,81 @@ def setup_logger():
     RESET = "\033[0m"
 
     class ColorFormatter(logging.Formatter):
-        def format(self, record):
-            if record.levelno == logging.INFO:
-                levelname_color = f"{RESET}{record.levelname:<8}{RESET}"
-            elif record.levelno == logging.WARNING:
-                levelname_color = f"{YELLOW}{record.levelname:<8}{RESET}"
-            elif record.levelno == logging.ERROR:
-                levelname_color = f"{RED}{record.levelname:<8}{RESET}"
-            else:
-                levelname_color = f"{record.levelname:<8}"
+        # padded (and colored) level names, built once instead of per record
+        COLORED_LEVELNAMES = {
+            logging.INFO:    f"{RESET}{'INFO':<8}{RESET}",
+            logging.WARNING: f"{YELLOW}{'WARNING':<8}{RESET}",
+            logging.ERROR:   f"{RED}{'ERROR':<8}{RESET}",
+        }
+
+        def __init__(self, fmt: str, use_color: bool = True):
+            super().__init__(fmt)
+            self.levelnames = dict(self.COLORED_LEVELNAMES) if use_color else {}
+            self.names = {}
 
-            record.levelname = levelname_color
-            record.name = f"{record.name:<25}"  # model name
-            return super().format(record)
+        def format(self, record):
+            levelname = self.levelnames.get(record.levelno)
+            if levelname is None:
+                levelname = self.levelnames[record.levelno] = f"{record.levelname:<8}"
+            name = self.names.get(record.name)
+            if name is None:
+                name = self.names[record.name] = f"{record.name:<25}"  # model name
+
+            # the record is shared by all handlers, restore it after formatting
+            orig_levelname, orig_name = record.levelname, record.name
+            record.levelname, record.name = levelname, name
+            try:
+                return super().format(record)
+            finally:
+                record.levelname, record.name = orig_levelname, orig_name
 
     log_format = "%(asctime)s - [%(levelname)s] [%(name)s] - %(message)s"
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(ColorFormatter(log_format))
+    # no ANSI colors when stdout is redirected
+    handler.setFormatter(ColorFormatter(log_format, use_color=sys.stdout.isatty()))
+    file_handler = logging.FileHandler("shell_testing.log")
+    file_handler.setFormatter(ColorFormatter(log_format, use_color=False))
+    # file writes are batched, flushed every 1024 records, on errors and at the end of each round
+    global _log_file_buffer
+    _log_file_buffer = logging.handlers.MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+    atexit.register(_log_file_buffer.close)
+
+    # the real handlers run in a background listener thread, loggers (also in 
+    # the seed workers) only put records into the queue and never block on IO
+    global _log_queue
+    _log_queue = multiprocessing.Queue(-1)
+    listener = logging.handlers.QueueListener(_log_queue, handler, _log_file_buffer, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     logging.basicConfig(
         level=logging.INFO,
         handlers=[
-            handler,
-            logging.FileHandler("shell_testing.log"),
+            _queue_handler(_log_queue),
         ]
     )
     return logging.getLogger("shell-metamorphic-testing")
 
 
+def _queue_handler(log_queue) -> logging.Handler:
+    """Handler that puts records into the log queue, leaving the formatting to the listener"""
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    return queue_handler
+
+
+# log record queue consumed by the listener of the main process, see setup_logger
+_log_queue = None
+# buffer in front of the log file, see setup_logger
+_log_file_buffer = None
+
+
+def flush_log_file():
+    """Write the buffered log records to the log file"""
+    if _log_file_buffer is not None:
+        _log_file_buffer.flush()
+
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Shell Metamorphic Differential Testing Framework")
@@ -76,19 +132,70 @@ def parse_args():
     return parser.parse_args()
 
 
-def register_all_mutators(chain: MutatorChain) -> MutatorChain:
+@functools.lru_cache(maxsize=1)
+def _discover_mutators(mutators_dir_mtime: int) -> Tuple[type, ...]:
+    """
+    Discover all mutator classes in the mutators package.
+    Cached, the mtime of the package directory is part of the cache key so added or removed mutators are picked up.
+    """
     from src.mutation_chain import mutators
     from src.mutation_chain import BaseMutator
 
+    # importing the modules registers their classes in BaseMutator._registry
+    module_names = set()
     for _, module_name, _ in pkgutil.iter_modules(mutators.__path__, mutators.__name__ + "."):
-        module = importlib.import_module(module_name)
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            # 判断是否是BaseMutator的子类
-            if issubclass(obj, BaseMutator) and obj != BaseMutator:
-                chain.register(obj())
+        importlib.import_module(module_name)
+        module_names.add(module_name)
+    # only mutators defined in the package modules (not e.g. the ones loaded by the validator), 
+    # ordered by module then class name
+    mutator_classes = sorted(
+        (cls for cls in BaseMutator._registry if cls.__module__ in module_names),
+        key=lambda cls: (cls.__module__, cls.__name__)
+    )
+    return tuple(mutator_classes)
+
+
+def register_all_mutators(chain: MutatorChain) -> MutatorChain:
+    from src.mutation_chain import mutators
+
+    mutators_dir_mtime = max(os.stat(path).st_mtime_ns for path in mutators.__path__)
+    for mutator_class in _discover_mutators(mutators_dir_mtime):
+        # all mutators share the chain's tree-sitter parser instead of building one each
+        chain.register(mutator_class(chain.parser))
     return chain
 
 
+# the mutator chain of this process, built lazily by get_chain
+_CHAIN = None
+
+def get_chain() -> MutatorChain:
+    """
+    Return the process-wide mutator chain, discovering and registering the mutators on first use.
+    """
+    global _CHAIN
+    if _CHAIN is None:
+        _CHAIN = register_all_mutators(MutatorChain())
+    return _CHAIN
+
+
+def remove_dir_in_background(dir_path: Path):
+    """
+    Remove a directory without blocking: rename it to a trash sibling, then delete it in a daemon thread.
+    """
+    if dir_path.exists():
+        os.rename(dir_path, dir_path.with_name(f"{dir_path.name}.trash.{uuid4().hex}"))
+    # also pick up trash left behind by an interrupted previous run
+    trash_paths = list(dir_path.parent.glob(f"{dir_path.name}.trash.*"))
+    if not trash_paths:
+        return
+
+    def _remove_all():
+        for trash_path in trash_paths:
+            shutil.rmtree(trash_path, ignore_errors=True)
+
+    threading.Thread(target=_remove_all, daemon=True).start()
+
+
 class GracefulExit(Exception):
     pass
 
@@ -96,6 +203,223 @@ def graceful_exit_handler(signum, frame):
     raise GracefulExit()
 
 
+# per-process state of the seed workers, built once by _init_worker
+_worker_tester = None
+# blake2b(bash code, posix code) -> testcase result, different seeds often mutate to identical scripts
+_worker_diff_memo = None
+# blake2b(bash code) -> posix code, the mutators are deterministic and seeds repeat across rounds
+_worker_transform_memo = None
+# (directory, fd) of the round's posix code directory
+_worker_dir_fd: Optional[Tuple[Path, int]] = None
+
+def _init_worker(tester_kwargs: Dict[str, Any], log_queue=None, diff_memo_size: int = 4096,
+                 transform_memo_size: int = 10000):
+    """
+    Initialize a seed worker process: build its mutator chain (unless inherited from the parent) 
+    and differential tester once. The tester has its own event loop and shell processes, so it is never inherited.
+    """
+    global _worker_tester, _worker_diff_memo, _worker_transform_memo
+    # SIGINT is handled by the main process only
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # forward log records to the listener of the main process
+    if log_queue is not None:
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(_queue_handler(log_queue))
+    get_chain()
+    _worker_tester = DifferentialTester(**tester_kwargs)
+    _worker_diff_memo = utils.LRUCache(diff_memo_size)
+    _worker_transform_memo = utils.LRUCache(transform_memo_size)
+
+
+def _get_dir_fd(dir_path: Path) -> int:
+    """
+    Return an open fd of the directory, kept open in the worker until the directory changes (next round),
+    so files in it are created with openat instead of resolving the full path each time.
+    """
+    global _worker_dir_fd
+    if _worker_dir_fd is not None:
+        if _worker_dir_fd[0] == dir_path:
+            return _worker_dir_fd[1]
+        os.close(_worker_dir_fd[1])
+        _worker_dir_fd = None
+    _worker_dir_fd = (dir_path, os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY))
+    return _worker_dir_fd[1]
+
+
+def _process_seed(seed_file: str, posix_code_dir: Path) -> Dict[str, Any]:
+    """
+    Mutate one test seed into POSIX shell code and run the differential test on it.
+    Runs inside a worker process, returns the testcase result (see tester.py).
+    """
+    logger = logging.getLogger("differential-testing")
+    try:
+        # apply mutation chain to generate equivalent POSIX shell code
+        bash_code = utils.read_file_bytes(seed_file)
+        transform_key = hashlib.blake2b(bash_code, digest_size=16).digest()
+        posix_code = _worker_transform_memo.get(transform_key)
+        if posix_code is None:
+            posix_code = get_chain().transform(bash_code)
+            _worker_transform_memo.put(transform_key, posix_code)
+        seed_stem = os.path.splitext(os.path.basename(seed_file))[0]
+        posix_name = f"{seed_stem}_posix.sh"
+        posix_file = posix_code_dir / posix_name
+        utils.write_file_bytes(posix_name, posix_code, dir_fd=_get_dir_fd(posix_code_dir))
+
+        # reuse the result of an identical (bash, posix) script pair tested before
+        memo_key = hashlib.blake2b(bash_code + b"\x00" + posix_code, digest_size=16).digest()
+        memo_result = _worker_diff_memo.get(memo_key)
+        if memo_result is not None:
+            return {**memo_result, "seed_name": str(seed_file)}
+
+        # Run differential test
+        testcase_result = _worker_tester.test(seed_file, posix_file)
+        if _is_cacheable(testcase_result):
+            _worker_diff_memo.put(memo_key, testcase_result)
+        return testcase_result
+
+    except Exception as e:
+        err_stack = traceback.format_exc()
+        logger.error(f"Error processing {seed_file}: {str(e)}\n{err_stack}")
+        return {
+            "seed_name": str(seed_file),
+            "tool_error": str(e)
+        }
+
+
+def _result_cache_namespace(config: Dict[str, Any]) -> str:
+    """
+    Digest of everything besides the bash seed that a testcase result depends on:
+    the mutation framework and built-in mutator sources, the generated mutator sources, 
+    the shell binaries, the timeout and how the shells are run.
+    """
+    digest = hashlib.sha256()
+    framework_dir = Path(__file__).resolve().parent / "src" / "mutation_chain"
+    for source_file in sorted(framework_dir.rglob("*.py")):
+        digest.update(source_file.relative_to(framework_dir).as_posix().encode("utf-8"))
+        digest.update(source_file.read_bytes())
+    for mutator_file in sorted(Path(config.get("results").get("mutators")).glob("*.py")):
+        digest.update(mutator_file.name.encode("utf-8"))
+        digest.update(mutator_file.read_bytes())
+    for shell_binpath in [config.get("bash_binpath"), config.get("posix_binpath")]:
+        digest.update(str(shell_binpath).encode("utf-8"))
+        if shell_binpath and Path(shell_binpath).is_file():
+            digest.update(str(Path(shell_binpath).stat().st_mtime_ns).encode("utf-8"))
+    digest.update(str(config.get("timeout", 5)).encode("utf-8"))
+    digest.update(str(config.get("reuse_shell", False)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _is_cacheable(testcase_result: Dict[str, Any]) -> bool:
+    """Tool errors and timeouts are not reproducible, don't cache them"""
+    if "tool_error" in testcase_result:
+        return False
+    return all(d["bash_exit_code"] != -1 and d["posix_exit_code"] != -1 for d in testcase_result["details"])
+
+
+def _skip_cached_seeds(seed_files: Iterable[str], result_cache: ResultCache,
+                       on_cached: Callable[[Dict[str, Any]], None], cache_keys: Dict[str, str]) -> Iterator[str]:
+    """
+    Filter out the seeds whose results are already cached.
+    Cached results are passed to on_cached, the cache keys of the 
+    remaining seeds are recorded in cache_keys (seed_name -> key).
+    """
+    for seed_file in seed_files:
+        key = result_cache.make_key(utils.read_file_bytes(seed_file))
+        cached = result_cache.get(key)
+        if cached is None:
+            cache_keys[str(seed_file)] = key
+            yield seed_file
+        else:
+            cached["seed_name"] = str(seed_file)
+            on_cached(cached)
+
+
+def _skip_duplicate_seeds(seed_files: Iterable[str], pending_keys: Dict[str, bytes],
+                          duplicates: Dict[bytes, List[str]]) -> Iterator[str]:
+    """
+    Filter out the seeds identical to one already pending in this round, they are not tested again.
+    The content keys of the pending seeds are recorded in pending_keys (seed_name -> key), 
+    the duplicates in duplicates (key -> seed_names) to share the result of the pending one.
+    A key stays in duplicates exactly while its seed is pending: the caller pops it when the result
+    arrives, a duplicate read after that is tested again.
+    """
+    for seed_file in seed_files:
+        key = hashlib.blake2b(utils.read_file_bytes(seed_file), digest_size=16).digest()
+        if key in duplicates:
+            duplicates[key].append(str(seed_file))
+            continue
+        duplicates[key] = []
+        pending_keys[str(seed_file)] = key
+        yield seed_file
+
+
+def _report_leftover_duplicates(duplicates: Dict[bytes, List[str]], 
+                                add_result: Callable[[Dict[str, Any]], None]) -> None:
+    """Report the duplicate seeds whose pending seed never returned a result, instead of dropping them"""
+    for duplicate_names in duplicates.values():
+        for duplicate_name in duplicate_names:
+            add_result({
+                "seed_name": duplicate_name,
+                "tool_error": "no result for the identical seed tested in this round"
+            })
+    duplicates.clear()
+
+
+def _submit_bounded(pool: ProcessPoolExecutor, fn: Callable, items: Iterable, max_in_flight: int,
+                    in_flight: set) -> Iterator[Any]:
+    """
+    Submit fn(item) for each item as items come in, with at most max_in_flight futures pending,
+    and yield the results as they complete. in_flight holds the pending futures (e.g. to cancel them).
+    """
+    def _collect_done():
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        in_flight.difference_update(done)
+        return [future.result() for future in done]
+
+    for item in items:
+        if len(in_flight) >= max_in_flight:
+            yield from _collect_done()
+        in_flight.add(pool.submit(fn, item))
+    while in_flight:
+        yield from _collect_done()
+
+
+def _prepare_feature(generator: MutatorGenerator, validator: MutatorValidator, feature: str,
+                     output_dir: str, max_attempts: int, mutator_code: Optional[str] = None):
+    """
+    Generate (unless already generated by a batch request), validate, refine and save the mutator of one feature.
+    """
+    logger = logging.getLogger("prepare-mutators")
+    logger.info(f"Generating mutator for feature: {feature}")
+    
+    # Generate and validate mutator in an iterative process
+    if mutator_code is None:
+        mutator_code = generator.generate_mutator(feature)
+    valid, feedback = validator.validate(mutator_code, feature)
+    
+    attempts = 1
+    
+    while not valid and attempts < max_attempts:
+        logger.info(f"Mutator validation failed. Attempt {attempts}/{max_attempts}. Regenerating...")
+        logger.debug(f"Validation feedback: {feedback}")
+        
+        # Regenerate with feedback
+        mutator_code = generator.refine_mutator(feature, feedback, mutator_code)
+        valid, feedback = validator.validate(mutator_code, feature)
+        attempts += 1
+        
+    if valid:
+        logger.info(f"Successfully validated mutator for {feature} (attempts: {attempts}), saving to {output_dir}")
+    else:
+        logger.error(f"Failed to validate mutator for {feature} after {max_attempts} attempts, requires manual correction! Feedback: {feedback}")
+    # Save validated mutator
+    generator.save_mutator(mutator_code, feature, output_dir)
+    # Clear LLM history for next iteration
+    generator.clear_history()
+
+
 def prepare_mutators(config: Dict[str, Any]):
     """
     Prepare phase: Generate and validate mutators.
@@ -104,8 +428,24 @@ def prepare_mutators(config: Dict[str, Any]):
     logger.info("Starting mutator preparation phase")
     
     # Initialize components
-    generator = MutatorGenerator(config.get("llm"), config.get("prompt_engine"))
+    generator = MutatorGenerator(config.get("llm"), config.get("prompt_engine"), config.get("cache"))
     validator = MutatorValidator(config.get("validation"))
+
+    # each validation thread gets its own generator, so conversation histories don't mix,
+    # all generators share the rate limiter of the main one
+    thread_local = threading.local()
+    generators = [generator]
+    generators_lock = threading.Lock()
+
+    def _get_thread_generator() -> MutatorGenerator:
+        thread_generator = getattr(thread_local, "generator", None)
+        if thread_generator is None:
+            thread_generator = MutatorGenerator(config.get("llm"), config.get("prompt_engine"), config.get("cache"))
+            thread_generator.llm_client.provider.rate_limiter = generator.llm_client.provider.rate_limiter
+            thread_local.generator = thread_generator
+            with generators_lock:
+                generators.append(thread_generator)
+        return thread_generator
     
     # Get features to process
     feature_list = config.get("features")
@@ -115,36 +455,42 @@ def prepare_mutators(config: Dict[str, Any]):
     output_dir = config.get("results").get("mutators")
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # Process each feature
-    for feature in feature_list:
-        logger.info(f"Generating mutator for feature: {feature}")
-        
-        # Generate and validate mutator in an iterative process
-        mutator_code = generator.generate_mutator(feature)
-        valid, feedback = validator.validate(mutator_code, feature)
-        
-        attempts = 1
-        max_attempts = config.get("validation").get("max_validation_attempts", 2)
-        
-        while not valid and attempts < max_attempts:
-            logger.info(f"Mutator validation failed. Attempt {attempts}/{max_attempts}. Regenerating...")
-            logger.debug(f"Validation feedback: {feedback}")
-            
-            # Regenerate with feedback
-            mutator_code = generator.refine_mutator(feature, feedback, mutator_code)
-            valid, feedback = validator.validate(mutator_code, feature)
-            attempts += 1
-            
-        if valid:
-            logger.info(f"Successfully validated mutator for {feature} (attempts: {attempts}), saving to {output_dir}")
-        else:
-            logger.error(f"Failed to validate mutator for {feature} after {max_attempts} attempts, requires manual correction! Feedback: {feedback}")
-        # Save validated mutator
-        generator.save_mutator(mutator_code, feature, output_dir)
-        # Clear LLM history for next iteration
-        generator.clear_history()
-
-    logger.info("Mutator preparation phase completed")
+    max_attempts = config.get("validation").get("max_validation_attempts", 2)
+    # number of features whose mutators are requested from the LLM at once
+    batch_size = max(1, config.get("llm").get("batch_size", 1))
+
+    # Process features batch by batch, batch requests are serialized here while 
+    # the validation (and refinement) of the features fans out to the thread pool
+    futures = {}
+    with ThreadPoolExecutor(max_workers=config.get("validation").get("workers", 8)) as executor:
+        for batch_start in range(0, len(feature_list), batch_size):
+            batch = feature_list[batch_start:batch_start + batch_size]
+            batch_codes = {}
+            if len(batch) > 1:
+                batch_codes = generator.generate_mutators_batch(batch)
+                generator.clear_history()
+
+            for feature in batch:
+                future = executor.submit(
+                    lambda feature, mutator_code: _prepare_feature(
+                        _get_thread_generator(), validator, feature, output_dir, max_attempts, mutator_code
+                    ),
+                    feature, batch_codes.get(feature)
+                )
+                futures[future] = feature
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error preparing mutator for {futures[future]}: {str(e)}\n{traceback.format_exc()}")
+
+    cache_hits = sum(g.get_cache_stats()["hits"] for g in generators)
+    cache_misses = sum(g.get_cache_stats()["misses"] for g in generators)
+    prompt_tokens = sum(g.get_token_usage()["prompt_tokens"] for g in generators)
+    completion_tokens = sum(g.get_token_usage()["completion_tokens"] for g in generators)
+    logger.info(f"Mutator preparation phase completed. LLM cache hits: {cache_hits}, misses: {cache_misses}, "
+                f"tokens: {prompt_tokens} prompt + {completion_tokens} completion")
 
 
 def run_difftest(config):
@@ -156,84 +502,125 @@ def run_difftest(config):
     logger.setLevel(logging.INFO)
     logger.info("Starting differential testing phase")
     
-    # init mutator chain
-    mutation_chain = MutatorChain()
-    register_all_mutators(mutation_chain)
-
-    # init differential tester and test reporter
-    diffTester = DifferentialTester(
-        bash_binpath=config.get("bash_binpath"),
-        posix_binpath=config.get("posix_binpath"),
-        timeout=config.get("timeout", 5)
+    # init seed workers, each builds its own mutator chain and differential tester
+    workers = config.get("workers") or os.cpu_count()
+    tester_kwargs = {
+        "bash_binpath":     config.get("bash_binpath"),
+        "posix_binpath":    config.get("posix_binpath"),
+        "timeout":          config.get("timeout", 5),
+        "reuse_shell":      config.get("reuse_shell", False),
+        "session_max_runs": config.get("shell_session_max_runs", 100),
+        "exec_cache_size":  config.get("exec_cache_size", 0),
+        "max_output_bytes": config.get("max_output_bytes", 0),
+    }
+    # build the mutator chain (mutator discovery, tree-sitter grammar) once in the parent, 
+    # forked workers inherit it copy-on-write, the get_chain() in _init_worker is then a no-op
+    get_chain()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(tester_kwargs, _log_queue, config.get("diff_memo_size", 4096), config.get("transform_memo_size", 10000))
     )
+    logger.info(f"Started {workers} seed workers")
+    # seeds submitted but not done yet, enough to keep the workers busy while seeds are being generated
+    max_in_flight = config.get("max_in_flight") or workers * 4
+
+    # init result cache, skips seeds which have been tested with the same mutators and shells
+    result_cache = None
+    result_cache_cfg = config.get("result_cache", {})
+    if result_cache_cfg.get("enabled", False):
+        result_cache = ResultCache(
+            result_cache_cfg.get("db_path", "results/result_cache.db"),
+            ttl=result_cache_cfg.get("ttl", 7 * 86400),
+            namespace=_result_cache_namespace(config)
+        )
+        result_cache.purge_expired()
+
+    # init test reporter
     report_dir = config.get("results").get("reports")
     reporter = TestReporter(report_dir)
     reporter.clear_reports()
     
     # infinite loop for testing
     round_num = 0 
+    round_cooldown_sec = config.get("round_cooldown_sec", 0)
+    last_round_duration = 0.0
+    # duplicate seeds of the current round waiting for the result of their pending seed, key -> seed_names
+    duplicates = {}
+    # prime the CPU usage counter, later calls compare against the previous call without blocking
+    psutil.cpu_percent(interval=None)
     signal.signal(signal.SIGINT, graceful_exit_handler) 
 
     try:
-        round_results = []
+        round_futures = set()
         
-        base_seed_dir = config.get("seeds_dir")
-        result_dir = config.get("results").get("posix_code")
-        if Path(base_seed_dir).exists():
-            shutil.rmtree(base_seed_dir)
-        if Path(result_dir).exists():
-            shutil.rmtree(result_dir)
+        base_seed_dir = Path(config.get("seeds_dir"))
+        result_dir = Path(config.get("results").get("posix_code"))
+        seedgen_path  = config.get("seedgen").get("binpath")
+        seedgen_count = config.get("seedgen").get("seed_count", 10)
+        seedgen_depth = config.get("seedgen").get("seed_depth", 100)
+        remove_dir_in_background(base_seed_dir)
+        remove_dir_in_background(result_dir)
 
         while True:
             round_num += 1
-            logger.info(f"Staring Round [{round_num}]. waiting for 5 seconds...")
-            sleep(5)
+            # cool down only if configured, or to back off while the CPU is saturated
+            cooldown = round_cooldown_sec
+            if psutil.cpu_percent(interval=None) > 85:
+                cooldown = max(cooldown, min(5, last_round_duration * 0.1))
+            if cooldown > 0:
+                logger.info(f"Staring Round [{round_num}]. waiting for {cooldown:.1f} seconds...")
+                sleep(cooldown)
+            else:
+                logger.info(f"Staring Round [{round_num}].")
+            round_start = monotonic()
 
             # generate test seeds
-            round_seed_dir = Path(base_seed_dir) / f"round_{round_num}"
+            round_seed_dir = base_seed_dir / f"round_{round_num}"
             round_seed_dir.mkdir(parents=True, exist_ok=True)
 
-            seedgen_path  = config.get("seedgen").get("binpath")
-            seedgen_count = config.get("seedgen").get("seed_count", 10)
-            seedgen_depth = config.get("seedgen").get("seed_depth", 100)
-            utils.generate_seed_scripts(seedgen_path, round_seed_dir, seedgen_count, seedgen_depth)
-
-            # get all test seed files
-            seed_files = list(Path(round_seed_dir).glob("*"))
-            
-            # process each test seed file
-            for seed_file in seed_files:
-                
-                # apply mutation chain to generate equivalent POSIX shell code
-                try:
-                    bash_code = seed_file.read_text()
-                    posix_code = mutation_chain.transform(bash_code)
-                    posix_code_dir = Path(result_dir) / f"round_{round_num}"
-                    posix_code_dir.mkdir(parents=True, exist_ok=True)
-                    posix_file = posix_code_dir / f"{seed_file.stem}_posix.sh"
-                    posix_file.write_text(posix_code)
-                    
-                    # Run differential test
-                    testcase_result = diffTester.test(seed_file, posix_file)
-                    round_results.append(testcase_result)
-                
-                except Exception as e:
-                    err_stack = traceback.format_exc()
-                    logger.error(f"Error processing {seed_file}: {str(e)}\n{err_stack}")
-                    round_results.append({
-                        "seed_name": str(seed_file),
-                        "tool_error": str(e)
-                    })
+            # process test seed files in parallel, each seed is dispatched as soon as it is generated
+            posix_code_dir = result_dir / f"round_{round_num}"
+            posix_code_dir.mkdir(parents=True, exist_ok=True)
+            process_seed = partial(_process_seed, posix_code_dir=posix_code_dir)
+            seed_files = utils.iter_seed_scripts(seedgen_path, round_seed_dir, seedgen_count, seedgen_depth)
+            # results are streamed to the report as they arrive instead of being kept for the round
+            add_result = partial(reporter.add_testcase_result, round_num)
+            cache_keys = {}
+            if result_cache is not None:
+                cache_stats_before = result_cache.get_stats()
+                seed_files = _skip_cached_seeds(seed_files, result_cache, add_result, cache_keys)
+            # identical seeds within the round are tested once, with or without the result cache
+            pending_keys = {}
+            duplicates.clear()
+            seed_files = _skip_duplicate_seeds(seed_files, pending_keys, duplicates)
+            # collect results as they complete, a slow seed doesn't hold back the others
+            for testcase_result in _submit_bounded(pool, process_seed, seed_files, max_in_flight, round_futures):
+                add_result(testcase_result)
+                seed_name = testcase_result["seed_name"]
+                if result_cache is not None:
+                    cache_key = cache_keys.pop(seed_name)
+                    if _is_cacheable(testcase_result):
+                        result_cache.set(cache_key, testcase_result)
+                for duplicate_name in duplicates.pop(pending_keys.pop(seed_name)):
+                    add_result({**testcase_result, "seed_name": duplicate_name})
+            _report_leftover_duplicates(duplicates, add_result)
+            if result_cache is not None:
+                cache_stats = result_cache.get_stats()
+                round_hits = cache_stats["hits"] - cache_stats_before["hits"]
+                round_lookups = round_hits + cache_stats["misses"] - cache_stats_before["misses"]
+                logger.info(f"Round [{round_num}] result cache hits: {round_hits}/{round_lookups}")
 
             # generate and save test reports in this round
-            round_summary = reporter.generate_round_report(round_num, round_results)
+            round_summary = reporter.finish_round(round_num)
             logger.info(f"End Round [{round_num}]. Round summary: Tests: {round_summary['total_tests']}, " 
                         f"Passed: {round_summary['passed']}, Failed: {round_summary['failed']}, "
                         f"Warnings: {round_summary['warnings']}, Errors: {round_summary['errors']}")
-            logger.debug(f"Report saved to {report_dir}/round_{round_num}")
+            logger.debug(f"Round [{round_num}] report appended to {reporter.jsonl_path}")
+            flush_log_file()
             
-            # clear round results
-            round_results.clear()
+            last_round_duration = monotonic() - round_start
 
     except GracefulExit:
         logger.info("[Graceful Exit] triggered. generate summary report and exit.")
@@ -241,12 +628,12 @@ def run_difftest(config):
             logger.info("No rounds completed. Exiting.")
             return
         # process the last round
-        if round_results:
-            round_summary = reporter.generate_round_report(round_num, round_results)
+        if reporter.round_pending:
+            _report_leftover_duplicates(duplicates, partial(reporter.add_testcase_result, round_num))
+            round_summary = reporter.finish_round(round_num)
             logger.info(f"End Round [{round_num}]. Round summary: Tests: {round_summary['total_tests']}, " 
                         f"Passed: {round_summary['passed']}, Failed: {round_summary['failed']}, ")
-            logger.info(f"Report saved to {report_dir}/round_{round_num}") 
-            round_results.clear()
+            logger.info(f"Round [{round_num}] report appended to {reporter.jsonl_path}")
         # summarize all rounds 
         saved_files, summary = reporter.generate_summary_report(config)
         logger.info(f"Testing complete. Summary:")
@@ -265,8 +652,13 @@ def run_difftest(config):
         logger.error(f"An unexpected error occurred: {str(e)}")
         traceback.print_exc()
     finally:
-        # do nothing
-        pass
+        # drop the seeds not started yet, only wait for the running ones
+        for future in round_futures:
+            future.cancel()
+        pool.shutdown()
+        reporter.close()
+        if result_cache is not None:
+            result_cache.close()
 
 
 if __name__ == "__main__":
@@ -1,97 +1,100 @@
 import json
 import re
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # filter rules
 
-def is_timeout_empty(detail):
-    bash_stdout_empty = detail.get("bash_stdout", "") == ""
-    posix_stdout_empty = detail.get("posix_stdout", "") == ""
+_RE_BRACKET = re.compile(r"\[: .*: unexpected operator")
+_RE_TEST = re.compile(r"test: .*: unexpected operator")
+
+TIMEOUT_PREFIX = "Command timed out after"
+
+def should_filter(detail):
+    # all rules inline, each field is looked up only once
+    bash_stdout = detail.get("bash_stdout", "")
+    posix_stdout = detail.get("posix_stdout", "")
     bash_stderr = detail.get("bash_stderr", "")
     posix_stderr = detail.get("posix_stderr", "")
     bash_exit_code = detail.get("bash_exit_code", 0)
     posix_exit_code = detail.get("posix_exit_code", 0)
-    if (bash_stdout_empty and posix_stdout_empty and
-        bash_stderr == "" and posix_stderr.startswith("Command timed out after") and
-        bash_exit_code == 0 and posix_exit_code == -1):
-        return True
-    if (bash_stdout_empty and posix_stdout_empty and
-        posix_stderr == "" and bash_stderr.startswith("Command timed out after") and
-        bash_exit_code == -1 and posix_exit_code == 0):
-        return True
-    return False
 
-def is_value_too_great_base(detail):
-    bash_stderr = detail.get("bash_stderr", "")
+    # timeout of one shell, while the other one outputs nothing
+    if bash_stdout == "" and posix_stdout == "":
+        if (bash_stderr == "" and posix_stderr.startswith(TIMEOUT_PREFIX) and
+            bash_exit_code == 0 and posix_exit_code == -1):
+            return True
+        if (posix_stderr == "" and bash_stderr.startswith(TIMEOUT_PREFIX) and
+            bash_exit_code == -1 and posix_exit_code == 0):
+            return True
+
+    # value too great for base
     if "value too great for base" in bash_stderr:
         return True
-    return False 
 
-def is_test_expr_error(detail):
-    bash_stderr = detail.get("bash_stderr", "")
-    posix_stderr = detail.get("posix_stderr", "")
-    if "==: unexpected operator" in posix_stderr:
-        return True
+    # test expression error, the regexes only run on candidate strings
+    if "unexpected operator" in posix_stderr:
+        if "==: unexpected operator" in posix_stderr:
+            return True
+        if _RE_BRACKET.search(posix_stderr) or _RE_TEST.search(posix_stderr):
+            return True
     if "[: Illegal number:" in posix_stderr:
         return True
-    if re.search(r"\[: .*: unexpected operator", posix_stderr):
-        return True
-    if re.search(r"test: .*: unexpected operator", posix_stderr):
-        return True
-    return False
 
-def is_built_in_error(detail):
-    bash_stderr = detail.get("bash_stderr", "")
-    posix_stderr = detail.get("posix_stderr", "")
-    if "help: not found" in posix_stderr:
-        return True
-    if "read: arg count" in posix_stderr:
+    # built-in error
+    if "help: not found" in posix_stderr or "read: arg count" in posix_stderr:
         return True
-    return False
 
-def is_pass_testcase(detail):
-    # check array error chain problem
-    bash_stdout = detail.get("bash_stdout", "") 
-    posix_stdout = detail.get("posix_stdout", "")
-    bash_stderr = detail.get("bash_stderr", "")
-    posix_stderr = detail.get("posix_stderr", "")
-    bash_exit_code = detail.get("bash_exit_code", 0)
-    posix_exit_code = detail.get("posix_exit_code", 0)
+    # pass testcase, check array error chain problem
     if (bash_stdout == posix_stdout and
-        bash_stderr ==  posix_stderr and
+        bash_stderr == posix_stderr and
         bash_exit_code != posix_exit_code):
         return True
+
+    # TODO: more rules
     return False
 
-# TODO: more rules
-FILTER_RULES = [
-    is_timeout_empty,
-    is_value_too_great_base,
-    is_test_expr_error,
-    is_built_in_error,
-    is_pass_testcase,
-]
+def filter_round(round_item):
+    """
+    Filter the failures of one round in place (the rounds are freshly parsed, no need to copy them),
+    returns (filtered round or None if nothing remains, original failure count, filtered failure count)
+    """
+    counts = [0, 0]  # original, filtered
+    new_failures = [fail for fail in round_item["failures"] if _filter_fail(fail, counts)]
+    if not new_failures:
+        return None, counts[0], counts[1]
+    round_item["failures"] = new_failures
+    return round_item, counts[0], counts[1]
 
-def should_filter(detail):
-    return any(rule(detail) for rule in FILTER_RULES)
+def _filter_fail(fail, counts):
+    """Filter the details of one failed seed in place, returns whether any detail remains"""
+    details = fail.get("details")
+    if details is None:
+        return True  # tool error, nothing to filter
+    counts[0] += len(details)
+    fail["details"] = new_details = [d for d in details if not should_filter(d)]
+    counts[1] += len(new_details)
+    return bool(new_details)
 
 def filter_failures(data):
+    # note: the rounds of data are filtered in place
     original_failure_count = 0
     filtered_failure_count = 0
     new_failure_details = []
 
     for round_item in data["failure_details"]:
-        new_failures = []
-        for fail in round_item["failures"]:
-            original_failure_count += len(fail["details"])
-            new_details = [d for d in fail["details"] if not should_filter(d)]
-            if new_details:
-                fail_copy = dict(fail)
-                fail_copy["details"] = new_details
-                new_failures.append(fail_copy)
-                filtered_failure_count += len(new_details)
-        if new_failures:
-            round_copy = dict(round_item)
-            round_copy["failures"] = new_failures
+        round_copy, original_count, filtered_count = filter_round(round_item)
+        original_failure_count += original_count
+        filtered_failure_count += filtered_count
+        if round_copy is not None:
             new_failure_details.append(round_copy)
 
     return {
@@ -102,14 +105,68 @@ def filter_failures(data):
         "failure_details": new_failure_details
     }
 
+def dumps_indented(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+SUMMARY_SCALARS = ("total_rounds_analyzed", "rounds_with_failures")
+
+def iter_rounds(f, scalars):
+    """
+    Stream the rounds of failure_details from a failures summary file one at a time,
+    the top-level counters are stored into scalars on the way
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is None:
+            if prefix == "failure_details.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in SUMMARY_SCALARS and event in ("number", "null"):
+                scalars[prefix] = value
+            continue
+        builder.event(event, value)
+        if prefix == "failure_details.item" and event == "end_map":
+            yield builder.value
+            builder = None
+
+def filter_failures_file(input_path, output_path):
+    """
+    Filter a failures summary file round by round, so only one round is in memory at a time
+    """
+    scalars = dict.fromkeys(SUMMARY_SCALARS)
+    original_failure_count = 0
+    filtered_failure_count = 0
+    with open(input_path, "rb") as f, open(output_path, "w", encoding="utf-8") as out:
+        out.write('{\n  "failure_details": [')
+        first = True
+        for round_item in iter_rounds(f, scalars):
+            round_copy, original_count, filtered_count = filter_round(round_item)
+            original_failure_count += original_count
+            filtered_failure_count += filtered_count
+            if round_copy is None:
+                continue
+            out.write("\n    " if first else ",\n    ")
+            out.write(dumps_indented(round_copy).replace("\n", "\n    "))
+            first = False
+        # the counters are only known at the end, so they follow the details
+        out.write("\n  ],\n" if not first else "],\n")
+        tail = dict(scalars)
+        tail["original_failure_count"] = original_failure_count
+        tail["filtered_failure_count"] = filtered_failure_count
+        out.write(",\n".join(f"  {json.dumps(k)}: {json.dumps(v)}" for k, v in tail.items()))
+        out.write("\n}")
+
 
 if __name__ == "__main__":
     input_path = "results/reports/failures_summary.json"
     output_path = "results/reports/failures_summary.filtered.json"
-    with open(input_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    filtered = filter_failures(data)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(filtered, f, indent=2, ensure_ascii=False)
-
-
+    if ijson is not None:
+        filter_failures_file(input_path, output_path)
+    else:
+        with open(input_path, "rb") as f:
+            data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        filtered = filter_failures(data)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(dumps_indented(filtered))
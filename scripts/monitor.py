@@ -3,7 +3,7 @@
 # execute: nohup python3 monitor.py > monitor.log 2>&1 &
 
 import os
-import psutil
+import signal
 import time
 from datetime import datetime
 
@@ -17,30 +17,52 @@ shell_lst = [
     "/workspace/shell/bash-5.2/bash",
 ]
 
-def is_shell_proc(proc):
-    try:
-        exe_path = os.path.realpath(proc.exe())
-        return exe_path in shell_lst
-    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-        return False
+# /proc/<pid>/exe links to the resolved path
+_shell_set = frozenset(os.path.realpath(shell) for shell in shell_lst)
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+def boot_time():
+    with open("/proc/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime "):
+                return int(line.split()[1])
+    return 0
+
+def proc_create_time(pid, btime):
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        stat = f.read()
+    # fields after the parenthesized command name, starttime is field 22 of the whole line
+    fields = stat[stat.rindex(b")") + 2:].split()
+    return btime + int(fields[19]) / CLK_TCK
 
 def monitor():
+    btime = boot_time()
     while True:
         now = time.time()
-        for proc in psutil.process_iter(['pid', 'name', 'create_time', 'exe']):
-            if not is_shell_proc(proc):
-                continue
-            try:
-                lifetime = now - proc.info['create_time']
-                if lifetime < MIN_LIFETIME:
+        # only the exe link is read for every process, the rest only for the shells
+        with os.scandir("/proc") as it:
+            for entry in it:
+                pid = entry.name
+                if not pid.isdigit():
+                    continue
+                try:
+                    exe_path = os.readlink(f"/proc/{pid}/exe")
+                    if exe_path not in _shell_set:
+                        continue
+                    lifetime = now - proc_create_time(pid, btime)
+                    if lifetime < MIN_LIFETIME:
+                        continue
+
+                    with open(f"/proc/{pid}/cmdline", "rb") as f:
+                        cmdline = f.read().rstrip(b"\0").split(b"\0")
+                    cmdline = [arg.decode("utf-8", errors="replace") for arg in cmdline]
+                    print(f"[{datetime.now()}] Kill {os.path.basename(exe_path)} {cmdline} (pid={pid} exe={exe_path}) "
+                            f"lifetime={lifetime:.1f}s")
+                    os.kill(int(pid), signal.SIGKILL)
+
+                except (OSError, ValueError, IndexError):
                     continue
-                
-                print(f"[{datetime.now()}] Kill {proc.name()} {proc.cmdline()} (pid={proc.pid} exe={proc.exe()}) "
-                        f"lifetime={lifetime:.1f}s")
-                proc.kill()
-            
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
         time.sleep(CHECK_INTERVAL)
 
 if __name__ == "__main__":
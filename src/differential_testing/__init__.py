@@ -3,5 +3,7 @@ Differential Testing Module for Shell Metamorphic Differential Testing Framework
 """
 
 from .tester import DifferentialTester
+from .result_cache import ResultCache
+from .shell_session import ShellSession
 
-__all__ = ["DifferentialTester"]
\ No newline at end of file
+__all__ = ["DifferentialTester", "ResultCache", "ShellSession"]
\ No newline at end of file
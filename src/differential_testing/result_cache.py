@@ -0,0 +1,83 @@
+"""
+Persistent cache of differential testing results, keyed by the content hash of the bash seed
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 86400
+
+
+class ResultCache:
+    """
+    sqlite3 backed cache: sha256(namespace + bash code) -> testcase result
+
+    The namespace should identify everything else the result depends on
+    (mutator sources, shell binaries, timeout), so that a changed setup never hits stale results.
+    """
+
+    def __init__(self, db_path: str, ttl: int = DEFAULT_TTL, namespace: str = ""):
+        """
+        Initialize the result cache
+
+        Args:
+            db_path: Path to the sqlite3 database file
+            ttl: Time to live of cache entries in seconds
+            namespace: Extra key material mixed into every cache key
+        """
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.namespace = namespace.encode("utf-8")
+        self.conn = sqlite3.connect(str(self.db_path))
+        # WAL: a write per result without a full journal sync, readers don't block the writer
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, bash_code: bytes) -> str:
+        return hashlib.sha256(self.namespace + b"\0" + bash_code).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT value FROM results WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), time.time() + self.ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache result {key}: {str(e)}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returns the number of deleted entries"""
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.conn.close()
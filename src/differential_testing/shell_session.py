@@ -0,0 +1,157 @@
+"""
+Long-lived shell processes that run test scripts one after another, saving a fork+exec per test
+"""
+
+import asyncio
+import logging
+import os
+import shlex
+import signal
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+class ShellSession:
+    """
+    A shell process started once with `-s`, reading commands from its stdin.
+
+    Each script is sourced in a fresh subshell `( . script )` so that variables, functions,
+    traps and the working directory don't leak into the next test. The end of a test is
+    detected by a random marker line printed on stdout (with the exit status) and stderr.
+    The process is recycled after max_runs tests, and killed and respawned on timeout.
+
+    Sourcing is not the same as running `shell script` in a fresh process: $0 is the session shell,
+    BASH_SOURCE and FUNCNAME have an extra frame, and a top-level `return` is legal instead of an error.
+    DifferentialTester keeps the scripts relying on these (SESSION_UNSAFE_PATTERN) out of the sessions,
+    other differences (e.g. $- or $PPID) are not detected.
+    """
+
+    def __init__(self, binpath: str, max_runs: int = 100, args: Tuple[str, ...] = ()):
+        """
+        Args:
+            binpath: Path to the shell executable
+            max_runs: Number of tests after which the shell process is replaced
+            args: Extra shell options put before `-s`, e.g. ("--noprofile", "--norc") for bash
+        """
+        self.binpath = binpath
+        self.args = tuple(args)
+        self.max_runs = max_runs
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.runs = 0
+        self._marker = f"__DIFFTEST_DONE_{uuid4().hex}__".encode("utf-8")
+
+    async def _spawn(self):
+        self.process = await asyncio.create_subprocess_exec(
+            self.binpath, *self.args, "-s",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+        self.runs = 0
+
+    async def close(self):
+        """Kill the shell process (and everything the tests left running in its process group)"""
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        if process.returncode is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    async def _read_until_marker(self, stream: asyncio.StreamReader) -> Tuple[bytes, bytes]:
+        """
+        Read the stream up to the marker line.
+        Returns the output before the marker and the rest of the marker line.
+        """
+        sep = b"\n" + self._marker
+        buf = bytearray()
+        search_from = 0
+        while True:
+            idx = buf.find(sep, search_from)
+            if idx >= 0:
+                end = buf.find(b"\n", idx + len(sep))
+                if end >= 0:
+                    return bytes(buf[:idx]), bytes(buf[idx + len(sep):end])
+            else:
+                search_from = max(0, len(buf) - len(sep))
+            chunk = await stream.read(1 << 16)
+            if not chunk:
+                raise EOFError(f"shell session {self.binpath} exited unexpectedly")
+            buf += chunk
+
+    async def run(self, script_path: Path, input_text: Optional[str] = None, timeout: int = 5,
+                  decode: bool = True) -> Optional[Dict]:
+        """
+        Run a script in the session
+
+        Args:
+            script_path: Path to the script
+            input_text: Optional input text provided on the script's stdin
+            timeout: Timeout in seconds
+            decode: Decode stdout and stderr, otherwise the raw bytes of a completed script are returned
+
+        Returns:
+            Dictionary with stdout, stderr, and return code like execute_shell_command,
+            or None if the session broke down (e.g. the script killed the session shell),
+            the caller should then fall back to a fresh process.
+        """
+        if self.process is None or self.process.returncode is not None or self.runs >= self.max_runs:
+            await self.close()
+            await self._spawn()
+        self.runs += 1
+
+        input_file = None
+        try:
+            if input_text:
+                fd, input_file = tempfile.mkstemp(prefix="difftest_input_")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(input_text.encode("utf-8"))
+            stdin_path = input_file or os.devnull
+            marker = self._marker.decode("utf-8")
+            command = (
+                f"( . {shlex.quote(os.path.abspath(script_path))} ) < {shlex.quote(stdin_path)}\n"
+                f"printf '\\n%s %d\\n' '{marker}' \"$?\"\n"
+                f"printf '\\n%s\\n' '{marker}' >&2\n"
+            )
+            self.process.stdin.write(command.encode("utf-8"))
+            await self.process.stdin.drain()
+
+            try:
+                (stdout, status), (stderr, _) = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_until_marker(self.process.stdout),
+                        self._read_until_marker(self.process.stderr)
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                await self.close()
+                return {
+                    "stdout": "",
+                    "stderr": f"Command timed out after {timeout} seconds",
+                    "exitcode": -1
+                }
+
+            if not decode:
+                return {"stdout": stdout, "stderr": stderr, "exitcode": int(status.strip())}
+            return {
+                "stdout": stdout.decode("utf-8", errors="replace"),
+                "stderr": stderr.decode("utf-8", errors="replace"),
+                "exitcode": int(status.strip())
+            }
+
+        except (EOFError, ConnectionError, ValueError) as e:
+            logger.debug("Shell session %s broke down: %s", self.binpath, e)
+            await self.close()
+            return None
+        finally:
+            if input_file is not None:
+                os.unlink(input_file)
@@ -2,20 +2,45 @@
 Differential Testing module for comparing bash and POSIX shell script behavior
 """
 
+import asyncio
+import hashlib
 import logging
+import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 import src.utils as utils
+from .shell_session import ShellSession
 
 logger = logging.getLogger(__name__)
 
+# scripts using these may change the state of the shell running them (exec, trap), or behave differently
+# when sourced than when run as `shell script` ($0, BASH_SOURCE, FUNCNAME, BASH_ARGV0, top-level return),
+# never run them in a shell session
+SESSION_UNSAFE_PATTERN = re.compile(rb"\b(?:exec|trap|return|BASH_SOURCE|FUNCNAME|BASH_ARGV0)\b|\$0|\$\{0\}")
+
+def _outputs_equal(a: str, b: str) -> bool:
+    """Outputs are equal modulo surrounding whitespace, only strip when they differ"""
+    return a == b or a.strip() == b.strip()
+
+def _to_text(output: Union[bytes, str]) -> str:
+    return output.decode("utf-8", errors="replace") if isinstance(output, bytes) else output
+
+def _decode_pair(bash_output: Union[bytes, str], posix_output: Union[bytes, str]) -> Tuple[str, str]:
+    """Decode the raw outputs of both shells, identical outputs are decoded once and share the string"""
+    if bash_output == posix_output:
+        text = _to_text(bash_output)
+        return text, text
+    return _to_text(bash_output), _to_text(posix_output)
+
 class DifferentialTester:
     """
     Performs differential testing between bash and POSIX shell scripts
     """
     
-    def __init__(self, bash_binpath: str = "/bin/bash", posix_binpath: str = "/bin/sh", timeout: int = 5):
+    def __init__(self, bash_binpath: str = "/bin/bash", posix_binpath: str = "/bin/sh", timeout: int = 5,
+                 reuse_shell: bool = False, session_max_runs: int = 100, exec_cache_size: int = 0,
+                 max_output_bytes: int = 0):
         """
         Initialize the differential tester
         
@@ -23,14 +48,91 @@ class DifferentialTester:
             bash_binpath: Path to bash executable
             posix_binpath: Path to POSIX shell executable
             timeout: Timeout for script execution in seconds
+            reuse_shell: Run the scripts in long-lived shell sessions instead of a new process per test.
+                Scripts are sourced there, see ShellSession for how that differs from a fresh process
+            session_max_runs: Number of tests after which a shell session is replaced
+            exec_cache_size: Size of the LRU of (shell, script content, input) -> execution result, 0 disables it.
+                Off by default: scripts reading $RANDOM, $$, the clock, ... are not deterministic
+            max_output_bytes: Kill a script as soon as its stdout or stderr exceeds this size and report it 
+                like a timeout, instead of buffering runaway output until the timeout. 0 means no limit.
+                Only applies to scripts run in a fresh process, not in the shell sessions
         """
         self.bash_binpath = bash_binpath
         self.posix_binpath = posix_binpath
         self.timeout = timeout
+        self.reuse_shell = reuse_shell
+        # shell sessions are bound to the event loop they were created in, so keep one loop
+        self._loop = asyncio.new_event_loop() if reuse_shell else None
+        self._sessions = {
+            "bash": ShellSession(bash_binpath, session_max_runs, ("--noprofile", "--norc")),
+            "posix": ShellSession(posix_binpath, session_max_runs),
+        } if reuse_shell else {}
+        self._exec_cache = utils.LRUCache(exec_cache_size) if exec_cache_size > 0 else None
+        self.max_output_bytes = max_output_bytes
         
     def test(self, bash_script: Path, posix_script: Path, test_inputs: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Test a bash script against its POSIX equivalent
+        Test a bash script against its POSIX equivalent, see test_async
+        """
+        if self._loop is not None:
+            return self._loop.run_until_complete(self.test_async(bash_script, posix_script, test_inputs))
+        return asyncio.run(self.test_async(bash_script, posix_script, test_inputs))
+
+    def close(self):
+        """Shut down the shell sessions, if any"""
+        if self._loop is None:
+            return
+        for session in self._sessions.values():
+            self._loop.run_until_complete(session.close())
+        self._loop.close()
+        self._loop = None
+
+    def _read_scripts(self, *scripts: Path) -> Optional[List[bytes]]:
+        """
+        Read the scripts once per test, only if their content is needed 
+        (the session pre-scan and the execution cache keys), None if not needed or unreadable
+        """
+        if not self.reuse_shell and self._exec_cache is None:
+            return None
+        try:
+            return [utils.read_file_bytes(script) for script in scripts]
+        except OSError:
+            return None
+
+    async def _execute(self, shell: str, binpath: str, script: Path, input_data: str,
+                       use_session: bool = True, script_digest: Optional[bytes] = None) -> Dict[str, Any]:
+        """Execute a script with the given shell, reusing the result of an identical execution if cached"""
+        if self._exec_cache is None or script_digest is None:
+            return await self._execute_uncached(shell, binpath, script, input_data, use_session)
+        key = (binpath, script_digest, input_data)
+        result = self._exec_cache.get(key)
+        if result is None:
+            result = await self._execute_uncached(shell, binpath, script, input_data, use_session)
+            # timeouts and tool errors are not cached
+            if result["exitcode"] != -1:
+                self._exec_cache.put(key, result)
+        return result
+
+    async def _execute_uncached(self, shell: str, binpath: str, script: Path, input_data: str,
+                                use_session: bool = True) -> Dict[str, Any]:
+        """Execute a script with the given shell, in its session if shells are reused"""
+        if self.reuse_shell and use_session:
+            result = await self._sessions[shell].run(script, input_data, self.timeout, decode=False)
+            if result is not None:
+                return result
+        return await utils.execute_shell_command_async(
+            [binpath, str(script)],
+            input_text=input_data,
+            timeout=self.timeout,
+            cpu_limit=self.timeout + 1,
+            decode=False,
+            max_output_bytes=self.max_output_bytes
+        )
+
+    async def test_async(self, bash_script: Path, posix_script: Path, test_inputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Test a bash script against its POSIX equivalent, 
+        the bash and POSIX shell of all inputs are executed concurrently
         
         Args:
             bash_file: Path to the bash script
@@ -50,46 +152,53 @@ class DifferentialTester:
             test_inputs = [""]
             
         details = []
-        
-        # Run tests with each input
-        for i, input_data in enumerate(test_inputs):
-            input_desc = f"input {i+1}" if input_data else "no input"
-            logger.debug(f"Running test with {input_desc}")
-            
-            # Execute bash script
-            bash_result = utils.execute_shell_command(
-                [self.bash_binpath, str(bash_script)],
-                input_text=input_data,
-                timeout=self.timeout
-            )
-            
-            # Execute posix script
-            posix_result = utils.execute_shell_command(
-                [self.posix_binpath, str(posix_script)],
-                input_text=input_data,
-                timeout=self.timeout
+
+        script_codes = self._read_scripts(bash_script, posix_script)
+        # scripts matching SESSION_UNSAFE_PATTERN never run in the shell sessions
+        use_session = self.reuse_shell and script_codes is not None and \
+            not any(SESSION_UNSAFE_PATTERN.search(code) for code in script_codes)
+        bash_digest = posix_digest = None
+        if self._exec_cache is not None and script_codes is not None:
+            bash_digest, posix_digest = (hashlib.blake2b(code, digest_size=16).digest() for code in script_codes)
+
+        async def run_input(input_data: str):
+            # Execute bash script and posix script concurrently
+            return await asyncio.gather(
+                self._execute("bash", self.bash_binpath, bash_script, input_data, use_session, bash_digest),
+                self._execute("posix", self.posix_binpath, posix_script, input_data, use_session, posix_digest)
             )
+
+        # a shell session runs one script at a time, so inputs only fly in parallel with fresh processes
+        if use_session:
+            executions = [await run_input(input_data) for input_data in test_inputs]
+        else:
+            executions = await asyncio.gather(*(run_input(input_data) for input_data in test_inputs))
+        
+        # Check results of each input
+        for i, (input_data, (bash_result, posix_result)) in enumerate(zip(test_inputs, executions)):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking test with %s", f"input {i+1}" if input_data else "no input")
             
-            # Check equivalence
-            stdout_match = bash_result["stdout"].strip() == posix_result["stdout"].strip()
-            stderr_match = bash_result["stderr"].strip() == posix_result["stderr"].strip()
-            exit_code_match = bash_result["exitcode"] == posix_result["exitcode"]
+            bash_stdout, posix_stdout = _decode_pair(bash_result["stdout"], posix_result["stdout"])
+            bash_stderr, posix_stderr = _decode_pair(bash_result["stderr"], posix_result["stderr"])
+            bash_exit_code, posix_exit_code = bash_result["exitcode"], posix_result["exitcode"]
 
+            # Check equivalence, the outputs only matter when the exit codes match
             status = "SUCCESS"
-            if not exit_code_match:
+            if bash_exit_code != posix_exit_code:
                 status = "FAILURE"
-            elif not stdout_match and not stderr_match:
+            elif not _outputs_equal(bash_stdout, posix_stdout) and not _outputs_equal(bash_stderr, posix_stderr):
                 status = "WARNING"
 
             result = {
                 "status": status,
                 "input": input_data,
-                "bash_stdout": bash_result["stdout"],
-                "posix_stdout": posix_result["stdout"],
-                "bash_stderr": bash_result["stderr"],
-                "posix_stderr": posix_result["stderr"],
-                "bash_exit_code": bash_result["exitcode"],
-                "posix_exit_code": posix_result["exitcode"],
+                "bash_stdout": bash_stdout,
+                "posix_stdout": posix_stdout,
+                "bash_stderr": bash_stderr,
+                "posix_stderr": posix_stderr,
+                "bash_exit_code": bash_exit_code,
+                "posix_exit_code": posix_exit_code,
             }
             
             details.append(result)
@@ -0,0 +1,88 @@
+"""
+Content-addressed disk cache for LLM responses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "~/.shell_difftest_cache"
+DEFAULT_TTL = 7 * 86400
+
+
+class FileBackend:
+    """
+    Stores each cache entry as a JSON file named by its key.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) < time.time():
+            entry_path.unlink(missing_ok=True)
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: str, ttl: int = DEFAULT_TTL) -> None:
+        entry_path = self._entry_path(key)
+        # write to a temp file first so readers never see a partial entry
+        tmp_path = entry_path.with_suffix(f".tmp.{os.getpid()}.{threading.get_ident()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"value": value, "expires_at": time.time() + ttl}, f)
+        os.replace(tmp_path, entry_path)
+
+
+class LLMCache:
+    """
+    Caches LLM responses keyed by the sha256 of the request fields.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.ttl     = config.get("ttl", DEFAULT_TTL)
+        self.backend = FileBackend(config.get("cache_dir", DEFAULT_CACHE_DIR)) if self.enabled else None
+        self.hits   = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(**fields: Any) -> str:
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.debug(f"LLM cache hit: {key}")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(key, value, self.ttl)
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry {key}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,18 +1,86 @@
+import asyncio
+import os
+from src.llm.cache import LLMCache
 from src.llm.factory import create_llm_provider
 from src.llm.providers.base import BaseProvider
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 class LLMClient:
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], cache_config: Optional[Dict[str, Any]] = None):
         self.provider = self._initialize_provider(config)
+        # only deterministic (temperature 0) responses are worth caching, LLM_CACHE=0 turns the cache off
+        cache_config = dict(cache_config or {})
+        if config.get("temperature") != 0 or os.environ.get("LLM_CACHE") == "0":
+            cache_config["enabled"] = False
+        self.cache = LLMCache(cache_config)
+        # tokens consumed by the requests actually sent (cache hits cost nothing),
+        # plain counters: a client is only used from one thread at a time
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
 
     def _initialize_provider(self, config: Dict[str, Any]) -> BaseProvider:
         return create_llm_provider(config)
 
+    def _cache_key(self, messages: List[Dict[str, Any]]) -> str:
+        """Key of a request: everything that is sent to the model"""
+        return self.cache.make_key(
+            provider=self.provider.provider_name,
+            messages=messages,
+            **self.provider.request_params
+        )
+
     def generate_response(self, prompt: str):
+        messages = self.provider.conversation_history + [{"role": "user", "content": prompt}]
+        cache_key = self._cache_key(messages) if self.cache.enabled else None
+        content = self.cache.get(cache_key) if cache_key is not None else None
+        if content is not None:
+            # keep the conversation history as if the LLM had been queried
+            self.provider.add_to_conversation({"role": "user", "content": prompt})
+            self.provider.add_to_conversation({"role": "assistant", "content": content})
+            return content
         response = self.provider.generate_response(prompt)
+        self._record_usage(response)
         content = self.provider.extract_response(response)
+        if cache_key is not None:
+            self.cache.set(cache_key, content)
+        return content
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """
+        Generate the responses of several independent prompts concurrently,
+        the prompts don't see (nor extend) the conversation history
+        """
+        return asyncio.run(self.agenerate_batch(prompts))
+
+    async def agenerate_batch(self, prompts: List[str]) -> List[str]:
+        return list(await asyncio.gather(*(self._agenerate_single_turn(prompt) for prompt in prompts)))
+
+    async def _agenerate_single_turn(self, prompt: str) -> str:
+        cache_key = self._cache_key(self.provider._single_turn_messages(prompt)) if self.cache.enabled else None
+        content = self.cache.get(cache_key) if cache_key is not None else None
+        if content is None:
+            response = await self.provider.agenerate_response(prompt)
+            self._record_usage(response)
+            content = self.provider.extract_response(response)
+            if cache_key is not None:
+                self.cache.set(cache_key, content)
         return content
 
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.completion_tokens += usage.completion_tokens or 0
+
+    def get_token_usage(self) -> Dict[str, int]:
+        return {
+            "prompt_tokens":     self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens":      self.prompt_tokens + self.completion_tokens,
+        }
+
+    def set_system_prompt(self, system_prompt: str):
+        self.provider.set_system_prompt(system_prompt)
+
     def clear_history(self):
         self.provider.clear_conversation_history() 
\ No newline at end of file
@@ -1,18 +1,21 @@
-from typing import Dict, Any
+from typing import Dict, Any, Type
 from .providers.base import BaseProvider
 from .providers.openai import OpenAIProvider
 from .providers.deepseek import DeepseekProvider
 
+# provider name in the config -> provider class
+PROVIDERS: Dict[str, Type[BaseProvider]] = {
+    "openai":   OpenAIProvider,
+    "deepseek": DeepseekProvider,
+}
+
 def create_llm_provider(config: Dict[str, Any]) -> BaseProvider:
     """
     Factory function to create an LLM provider based on the configuration. 
     """
 
     provider_name = config.get("provider")
-    
-    if provider_name == "openai":
-        return OpenAIProvider(config)
-    elif provider_name == "deepseek":
-        return DeepseekProvider(config)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider_name}")
\ No newline at end of file
+    provider_cls = PROVIDERS.get(provider_name)
+    if provider_cls is None:
+        raise ValueError(f"Unknown LLM provider: {provider_name}")
+    return provider_cls(config)
\ No newline at end of file
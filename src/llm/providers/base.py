@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from src.llm.utils import RateLimiter
 
 class BaseProvider(ABC):
@@ -11,9 +11,19 @@ class BaseProvider(ABC):
         self.model         = config.get("model")
         self.max_tokens    = config.get("max_tokens")
         self.temperature   = config.get("temperature")
+        # the invariant part of every request, only the messages change from call to call
+        self.request_params: Dict[str, Any] = {
+            "model":       self.model,
+            "max_tokens":  self.max_tokens,
+            "temperature": self.temperature,
+        }
         self.rate_limit_per_minute = config.get("rate_limit_per_minute", 60)
         self.rate_limiter = RateLimiter(self.rate_limit_per_minute)
+        self.system_prompt: Optional[str] = None
         self.conversation_history: List[Dict[str, str]] = []
+        # number of messages kept besides the system prompt, the whole history is sent with every request.
+        # 0 keeps everything
+        self.history_limit = config.get("history_limit", 20)
 
     @abstractmethod
     def generate_response(self, prompt: str) -> Any:
@@ -27,6 +37,28 @@ class BaseProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def agenerate_response(self, prompt: str) -> Any:
+        """
+        Generate a response asynchronously, so several prompts can be in flight at once.
+        The request is independent of the conversation history: only the system prompt 
+        and the prompt are sent, and nothing is added to the history.
+        
+        Args:
+            prompt (str): The input prompt for the LLM.
+        Returns:
+            Any: The generated response from the LLM.
+        """
+        pass
+
+    def _single_turn_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Messages of a request without conversation history, see agenerate_response"""
+        messages = []
+        if self.system_prompt is not None:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
     @abstractmethod
     def extract_response(self, response: Any) -> str:
         """
@@ -62,6 +94,36 @@ class BaseProvider(ABC):
 
     def add_to_conversation(self, message:Dict[str, str]) -> None:
         self.conversation_history.append(message)
+        self._trim_history()
+
+    def _trim_history(self) -> None:
+        """
+        Drop the oldest messages beyond history_limit, the system prompt is always kept 
+        and the kept history still starts with a user message
+        """
+        if not self.history_limit:
+            return
+        history = self.conversation_history
+        start = 1 if history and history[0].get("role") == "system" else 0
+        end = len(history) - self.history_limit
+        if end <= start:
+            return
+        while end < len(history) - 1 and history[end].get("role") != "user":
+            end += 1
+        del history[start:end]
+
+    def set_system_prompt(self, system_prompt: str) -> None:
+        """
+        Set the system prompt, which always stays the first message of the conversation.
+        Keeping this prefix byte-identical across requests lets the provider reuse its prompt cache.
+        """
+        self.system_prompt = system_prompt
+        if self.conversation_history and self.conversation_history[0].get("role") == "system":
+            self.conversation_history[0] = {"role": "system", "content": system_prompt}
+        else:
+            self.conversation_history.insert(0, {"role": "system", "content": system_prompt})
 
     def clear_conversation_history(self) -> None:
         self.conversation_history = []
+        if self.system_prompt is not None:
+            self.conversation_history.append({"role": "system", "content": self.system_prompt})
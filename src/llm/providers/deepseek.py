@@ -1,17 +1,19 @@
-import openai
 from typing import Dict, Any
 from .base import BaseProvider
-from ..utils.retry import retry_with_exponential_backoff
+from .openai import shared_client, AsyncClientMixin
+from ..utils.retry import retry_with_exponential_backoff, aretry_with_exponential_backoff
 
-class DeepseekProvider(BaseProvider):
+class DeepseekProvider(AsyncClientMixin, BaseProvider):
     """
     Provider implementation for OpenAI's API using the official Python library.
     """
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
+        import openai
+        self._openai = openai
         self.api_key = config.get("api_key")
-        self.client = openai.OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com")
+        self.client = shared_client(self.api_key, "https://api.deepseek.com")
 
     def generate_response(self, prompt: str):
         """
@@ -20,35 +22,48 @@ class DeepseekProvider(BaseProvider):
         self.rate_limiter.wait()
 
         # deepseek Few-shot 可以提升模型的输出效果
-        self.conversation_history.append({"role": "user", "content": prompt})
+        self.add_to_conversation({"role": "user", "content": prompt})
 
         def _generate_response():
-            return self.client.chat.completions.create(
-                model       = self.model,
-                messages    = self.conversation_history,
-                max_tokens  = self.max_tokens,
-                temperature = self.temperature
-            )
+            return self.client.chat.completions.create(messages=self.conversation_history, **self.request_params)
         response = retry_with_exponential_backoff(
             func = _generate_response,
             max_attempts=5,
             initial_delay=1,
             backoff_factor=2,
             max_delay=10,
-            exceptions=(openai.error.OpenAIError,)
+            exceptions=(self._openai.OpenAIError,)
         )
         
-        self.conversation_history.append(response["choices"][0]["message"])
+        self.add_to_conversation({"role": "assistant", "content": self.extract_response(response)})
         
         return response
 
-    def extract_response(self, response: Dict[str, Any]) -> str:
+    async def agenerate_response(self, prompt: str):
+        """
+        Generate a single-turn response asynchronously, see BaseProvider.agenerate_response
+        """
+        await self.rate_limiter.async_wait()
+
+        aclient = self._get_async_client("https://api.deepseek.com")
+        messages = self._single_turn_messages(prompt)
+
+        async def _generate_response():
+            return await aclient.chat.completions.create(messages=messages, **self.request_params)
+        return await aretry_with_exponential_backoff(
+            func = _generate_response,
+            max_attempts=5,
+            initial_delay=1,
+            backoff_factor=2,
+            max_delay=10,
+            exceptions=(self._openai.OpenAIError,)
+        )
+
+    def extract_response(self, response: Any) -> str:
         """
         extract the deepseek API response from the generated text.
         """
-        if "error" in response:
-            raise Exception(f"Error from OpenAI API: {response['error']}")
         try:
-            return response["choices"][0]["message"]["content"]
-        except (KeyError, IndexError):
+            return response.choices[0].message.content
+        except (AttributeError, IndexError):
             raise Exception("Invalid response format from OpenAI API")
\ No newline at end of file
@@ -1,17 +1,48 @@
-import openai
-from typing import Dict, Any
+import asyncio
+import functools
+from typing import Dict, Any, Optional
 from .base import BaseProvider
-from ..utils.retry import retry_with_exponential_backoff
+from ..utils.retry import retry_with_exponential_backoff, aretry_with_exponential_backoff
 
-class OpenAIProvider(BaseProvider):
+
+@functools.lru_cache(maxsize=None)
+def shared_client(api_key: str, base_url: Optional[str] = None) -> "openai.OpenAI":
+    """
+    One client (and so one HTTP connection pool) per API endpoint and key, shared by all providers,
+    e.g. the per-thread generators of the prepare phase reuse each other's open connections.
+    The client is thread-safe.
+    """
+    import openai
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+
+class AsyncClientMixin:
+    """
+    Lazily created openai.AsyncOpenAI client of a provider (self._openai being the openai module). 
+    Its connections belong to the event loop they were opened in, so a new client is made per loop.
+    """
+    _aclient = None
+    _aclient_loop = None
+
+    def _get_async_client(self, base_url: Optional[str] = None) -> "openai.AsyncOpenAI":
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = self._openai.AsyncOpenAI(api_key=self.api_key, base_url=base_url)
+            self._aclient_loop = loop
+        return self._aclient
+
+class OpenAIProvider(AsyncClientMixin, BaseProvider):
     """
     Provider implementation for OpenAI's API using the official Python library.
     """
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
+        # the openai package is heavy to import, only load it once a provider is actually created
+        import openai
+        self._openai = openai
         self.api_key = config.get("api_key")
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = shared_client(self.api_key)
 
     def generate_response(self, prompt: str):
         """
@@ -28,44 +59,57 @@ class OpenAIProvider(BaseProvider):
         """
         self.rate_limiter.wait()
 
-        self.conversation_history.append({"role": "user", "content": prompt})
+        self.add_to_conversation({"role": "user", "content": prompt})
 
         def _generate_response():
-            return self.client.chat.completions.create(
-                model       = self.model,
-                messages    = self.conversation_history,
-                max_tokens  = self.max_tokens,
-                temperature = self.temperature
-            )
+            return self.client.chat.completions.create(messages=self.conversation_history, **self.request_params)
         response = retry_with_exponential_backoff(
             func = _generate_response,
             max_attempts=5,
             initial_delay=1,
             backoff_factor=2,
             max_delay=10,
-            exceptions=(openai.error.OpenAIError,)
+            exceptions=(self._openai.OpenAIError,)
         )
         
-        self.conversation_history.append(response["choices"][0]["message"])
+        self.add_to_conversation({"role": "assistant", "content": self.extract_response(response)})
         
         return response
 
-    def extract_response(self, response: Dict[str, Any]) -> str:
+    async def agenerate_response(self, prompt: str):
+        """
+        Generate a single-turn response asynchronously, see BaseProvider.agenerate_response
+        """
+        await self.rate_limiter.async_wait()
+
+        aclient = self._get_async_client(None)
+        messages = self._single_turn_messages(prompt)
+
+        async def _generate_response():
+            return await aclient.chat.completions.create(messages=messages, **self.request_params)
+        return await aretry_with_exponential_backoff(
+            func = _generate_response,
+            max_attempts=5,
+            initial_delay=1,
+            backoff_factor=2,
+            max_delay=10,
+            exceptions=(self._openai.OpenAIError,)
+        )
+
+    def extract_response(self, response: Any) -> str:
         """
         extract the OpenAI API response from the generated text.
         
         Args:
-            response (Dict): The response from the OpenAI API.
+            response (ChatCompletion): The response from the OpenAI API.
             
         Returns:
             str: The generated text content.
             
         Raises:
-            Exception: If the response contains an error.
+            Exception: If the response has no message.
         """
-        if "error" in response:
-            raise Exception(f"Error from OpenAI API: {response['error']}")
         try:
-            return response["choices"][0]["message"]["content"]
-        except (KeyError, IndexError):
+            return response.choices[0].message.content
+        except (AttributeError, IndexError):
             raise Exception("Invalid response format from OpenAI API")
\ No newline at end of file
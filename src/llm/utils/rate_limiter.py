@@ -1,3 +1,4 @@
+import asyncio
 from time import time, sleep
 from threading import Lock
 
@@ -22,23 +23,44 @@ class RateLimiter:
         self.allowance = min(self.allowance + refill_amount, self.rate_limit_per_minute)
         self.last_check = current_time
 
-    def acquire(self) -> bool:
+    def _try_acquire(self) -> float:
         """
-        Attempt to acquire permission to proceed with a request.
+        Take a request allowance if there is one.
 
         Returns:
-            bool: True if the request is allowed, False otherwise.
+            float: 0 if the request is allowed, otherwise the seconds until the next allowance.
         """
         with self.lock:
             self._refill()
             if self.allowance >= 1:
                 self.allowance -= 1
-                return True
-            return False
+                return 0.0
+            return (1 - self.allowance) * 60 / self.rate_limit_per_minute
+
+    def acquire(self) -> bool:
+        """
+        Attempt to acquire permission to proceed with a request.
+
+        Returns:
+            bool: True if the request is allowed, False otherwise.
+        """
+        return self._try_acquire() == 0.0
 
     def wait(self):
         """
-        Block until a request is allowed.
+        Block until a request is allowed, sleeping (outside the lock) until the next allowance is due.
+        Another thread may take that allowance first, then we just sleep again.
+        """
+        delay = self._try_acquire()
+        while delay > 0:
+            sleep(delay)
+            delay = self._try_acquire()
+
+    async def async_wait(self):
+        """
+        Wait until a request is allowed, without blocking the event loop.
         """
-        while not self.acquire():
-            sleep(0.1)
\ No newline at end of file
+        delay = self._try_acquire()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._try_acquire()
@@ -1,5 +1,32 @@
+import asyncio
+import functools
+import inspect
 import time
 import logging
+import random
+
+JITTER_MODES = ("none", "full", "decorrelated")
+
+
+def _backoff_delay(attempt, prev_delay, initial_delay, backoff_factor, max_delay, jitter):
+    """
+    Delay before the retry following the given (0-based) failed attempt.
+    - none: initial_delay * backoff_factor ** attempt
+    - full: uniform in [0, initial_delay * backoff_factor ** attempt]
+    - decorrelated: uniform in [initial_delay, prev_delay * backoff_factor], 
+      so concurrent callers failing together don't retry together
+    """
+    if jitter == "decorrelated":
+        delay = random.uniform(initial_delay, prev_delay * backoff_factor)
+    elif jitter == "full":
+        delay = random.uniform(0, initial_delay * (backoff_factor ** attempt))
+    elif jitter == "none":
+        delay = initial_delay * (backoff_factor ** attempt)
+    else:
+        raise ValueError(f"Unknown jitter mode: {jitter}, expected one of {JITTER_MODES}")
+    if max_delay:
+        delay = min(delay, max_delay)
+    return delay
 
 
 def retry_with_exponential_backoff(
@@ -8,7 +35,8 @@ def retry_with_exponential_backoff(
     initial_delay=1,
     backoff_factor=2,
     max_delay=None,
-    exceptions=(Exception,)
+    exceptions=(Exception,),
+    jitter="decorrelated"
 ):
     """
     Retry a function with [exponential backoff].
@@ -20,28 +48,69 @@ def retry_with_exponential_backoff(
         backoff_factor (float): Factor by which the delay increases after each attempt.
         max_delay (float): Maximum delay between retries in seconds.
         exceptions (tuple): Tuple of exception types to catch and retry.
+        jitter (str): Randomization of the delays, "none", "full" or "decorrelated", see _backoff_delay.
+
+    If func is a coroutine function, the coroutine of aretry_with_exponential_backoff is returned
+    for the caller to await, so the retries don't block the event loop.
     """
+    if inspect.iscoroutinefunction(func):
+        return aretry_with_exponential_backoff(
+            func,
+            max_attempts=max_attempts,
+            initial_delay=initial_delay,
+            backoff_factor=backoff_factor,
+            max_delay=max_delay,
+            exceptions=exceptions,
+            jitter=jitter
+        )
     logger = logging.getLogger(__name__)
+    delay = initial_delay
     for attempt in range(max_attempts):
         try:
             return func()
         except exceptions as e:
             if attempt < max_attempts - 1:
-                delay = initial_delay * (backoff_factor ** attempt)
-                if max_delay:
-                    delay = min(delay, max_delay)
+                delay = _backoff_delay(attempt, delay, initial_delay, backoff_factor, max_delay, jitter)
                 logger.warning(f"Retry attempt {attempt + 1} failed: {e}. Retrying in {delay:.2f} seconds...")
                 time.sleep(delay)
             else:
                 logger.error(f"All {max_attempts} retry attempts failed.")
                 raise e
 
+async def aretry_with_exponential_backoff(
+    func,
+    max_attempts=5,
+    initial_delay=1,
+    backoff_factor=2,
+    max_delay=None,
+    exceptions=(Exception,),
+    jitter="decorrelated"
+):
+    """
+    Async version of retry_with_exponential_backoff: func returns a coroutine, 
+    which is awaited, and the delays don't block the event loop.
+    """
+    logger = logging.getLogger(__name__)
+    delay = initial_delay
+    for attempt in range(max_attempts):
+        try:
+            return await func()
+        except exceptions as e:
+            if attempt < max_attempts - 1:
+                delay = _backoff_delay(attempt, delay, initial_delay, backoff_factor, max_delay, jitter)
+                logger.warning(f"Retry attempt {attempt + 1} failed: {e}. Retrying in {delay:.2f} seconds...")
+                await asyncio.sleep(delay)
+            else:
+                logger.error(f"All {max_attempts} retry attempts failed.")
+                raise e
+
 def retry_on_exception(
     max_attempts=5,
     initial_delay=1,
     backoff_factor=2,
     max_delay=None,
-    exceptions=(Exception,)
+    exceptions=(Exception,),
+    jitter="decorrelated"
 ):
     """
     Decorator to retry a function with exponential backoff on specified exceptions.
@@ -52,8 +121,26 @@ def retry_on_exception(
         backoff_factor (float): Factor by which the delay increases after each attempt.
         max_delay (float): Maximum delay between retries in seconds.
         exceptions (tuple): Tuple of exception types to catch and retry.
+        jitter (str): Randomization of the delays, "none", "full" or "decorrelated", see _backoff_delay.
+
+    Coroutine functions are decorated with an async wrapper retrying via aretry_with_exponential_backoff.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await aretry_with_exponential_backoff(
+                    lambda: func(*args, **kwargs),
+                    max_attempts=max_attempts,
+                    initial_delay=initial_delay,
+                    backoff_factor=backoff_factor,
+                    max_delay=max_delay,
+                    exceptions=exceptions,
+                    jitter=jitter
+                )
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             return retry_with_exponential_backoff(
                 lambda: func(*args, **kwargs),
@@ -61,7 +148,8 @@ def retry_on_exception(
                 initial_delay=initial_delay,
                 backoff_factor=backoff_factor,
                 max_delay=max_delay,
-                exceptions=exceptions
+                exceptions=exceptions,
+                jitter=jitter
             )
         return wrapper
     return decorator
\ No newline at end of file
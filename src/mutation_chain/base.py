@@ -1,12 +1,86 @@
+import re
+import tree_sitter
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from operator import itemgetter
+from typing import Any, Dict, Iterator, Optional, Tuple
 from src.utils import initialize_parser
 
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings (binary search on slice compare)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix of two byte strings, at most limit"""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point_at(source: bytes, offset: int) -> Tuple[int, int]:
+    """(row, column) of a byte offset, as tree-sitter points"""
+    row = source.count(b"\n", 0, offset)
+    column = offset - (source.rfind(b"\n", 0, offset) + 1)
+    return row, column
+
+
+def _splice(source, patches: list):
+    """Replace the patches' [start, end) ranges of source (str or bytes), patches sorted by start descending"""
+    # patches都在源码范围内且互不重叠时(与从后往前替换的结果相同), 
+    # 从前往后拼接一次, 而不是每个patch都复制整个字符串
+    ordered = patches[::-1]
+    bounds = [0]
+    for start, end, _ in ordered:
+        bounds.append(start)
+        bounds.append(end)
+    bounds.append(len(source))
+    if all(bounds[k] <= bounds[k + 1] for k in range(len(bounds) - 1)):
+        parts = []
+        cursor = 0
+        for start, end, replacement in ordered:
+            parts.append(source[cursor:start])
+            parts.append(replacement)
+            cursor = end
+        parts.append(source[cursor:])
+        return source[:0].join(parts)
+
+    for start, end, replacement in patches:
+        source = source[:start] + replacement + source[end:]
+    return source
+
+
 class BaseMutator(ABC):
     #  be overridden by subclasses
     NAME = "base_transformer"  # 转换器名称
     DESCRIPTION = "基础转换器"  # 转换器描述
     TARGET_FEATURES = set()    # 目标Bash特性集合
+    # 代码中必须出现的语法片段(正则), 不匹配时该转换器不可能产生patch, 转换器链直接跳过它; None表示总是运行
+    TRIGGER_PATTERN = None
+
+    # 所有子类, 在定义时自动注册
+    _registry = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseMutator._registry.append(cls)
+        # 遍历AST时每个节点都要检查 node.type in target_node_types, 用frozenset代替list
+        if isinstance(cls.__dict__.get("target_node_types"), (list, tuple, set)):
+            cls.target_node_types = frozenset(cls.target_node_types)
+        if isinstance(cls.__dict__.get("TRIGGER_PATTERN"), str):
+            cls.TRIGGER_PATTERN = re.compile(cls.TRIGGER_PATTERN)
     
     def __init__(self, parser=None):
         self.parser = parser or initialize_parser()
@@ -24,11 +98,61 @@ class BaseMutator(ABC):
             转换后的代码和更新后的上下文信息
         """
         # patches = []
-        # ast = self.parser.parse(bytes(source_code, "utf8"))
+        # ast = self.parse(source_code, context)
         # ...
         # return self.apply_patches(source_code, patches), context
         pass
 
+    @staticmethod
+    def iter_nodes(root: tree_sitter.Node) -> Iterator[tree_sitter.Node]:
+        """
+        Pre-order walk of root and all its descendants, the same order as recursing over node.children
+        
+        Uses a TreeCursor, so no Python frame per node and no node.children list per level.
+        """
+        cursor = root.walk()
+        while True:
+            yield cursor.node
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+
+    def parse(self, source_code: str, context: Dict[str, Any]) -> tree_sitter.Tree:
+        """
+        Parse source code into AST, reusing the last AST of the transform chain
+        
+        The last (source, source bytes, AST) is cached in context['ast_cache'], if the source has changed 
+        since then, the changed byte range is applied to the old AST by tree.edit and 
+        tree-sitter reparses incrementally, reusing the unchanged subtrees.
+        An unchanged source (the common case along the chain) is neither re-encoded nor reparsed.
+        """
+        cached = context.get('ast_cache')
+        if cached is not None and cached[0] == source_code:
+            return cached[2]
+        source_bytes = bytes(source_code, "utf8")
+        if cached is None:
+            tree = self.parser.parse(source_bytes)
+        else:
+            _, old_bytes, tree = cached
+            # describe the change as a single edit: common prefix + replaced range + common suffix
+            start = _common_prefix_len(old_bytes, source_bytes)
+            suffix = _common_suffix_len(old_bytes, source_bytes, min(len(old_bytes), len(source_bytes)) - start)
+            old_end = len(old_bytes) - suffix
+            new_end = len(source_bytes) - suffix
+            tree.edit(
+                start_byte=start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=_point_at(old_bytes, start),
+                old_end_point=_point_at(old_bytes, old_end),
+                new_end_point=_point_at(source_bytes, new_end),
+            )
+            tree = self.parser.parse(source_bytes, tree)
+        context['ast_cache'] = (source_code, source_bytes, tree)
+        return tree
+
     def apply_patches(self, source_code: str, patches: list) -> str:
         """Apply code replacement patches (shared logic for all mutators)"""
         if not patches:
@@ -40,36 +164,47 @@ class BaseMutator(ABC):
         # (0, 16, "arr_1=${bar[1]}"), (10, 15, "bar_1")
         # 只保留 (0, 16, "arr_1=${bar[1]}")
         
-        filtered_patches = []
-        for i, current_patch in enumerate(patches):
-            start, end = current_patch[0], current_patch[1]
-            is_contained = False
-
-            for j, other_patch in enumerate(patches):
-                if i == j:
-                    continue # itself 
-                other_start, other_end = other_patch[0], other_patch[1]
-                
-                # special case: 完全相同的patch
-                if other_start == start and other_end == end:
-                    if i > j:
-                        is_contained = True
-                        break
-                
+        # 按起点排序扫描, O(N log N): 对每个起点, 维护起点更小(或相等)的patches的最大终点
+        # - range patch 被包含 <=> 存在其他patch满足 other_start <= start and end <= other_end
+        #   (完全相同的range patches互相包含, 都被过滤)
+        # - point patch 被包含 <=> 存在patch满足 other_start < start < other_end, 或存在更早的相同point
+        starts = [patch[0] for patch in patches]
+        order = sorted(range(len(patches)), key=starts.__getitem__)
+        keep = [True] * len(patches)
+        seen_points = set()
+        best_end, best_idx, second_end = None, -1, None   # 已扫描patches中最大/次大的终点
+        g = 0
+        while g < len(order):
+            group_start = patches[order[g]][0]
+            group_end = g
+            while group_end < len(order) and patches[order[group_end]][0] == group_start:
+                group_end += 1
+            group = order[g:group_end]
+            strict_best_end = best_end   # 起点严格更小的patches的最大终点
+            for k in group:
+                other_end = patches[k][1]
+                if best_end is None or other_end > best_end:
+                    best_end, best_idx, second_end = other_end, k, best_end
+                elif second_end is None or other_end > second_end:
+                    second_end = other_end
+            for k in group:
+                start, end = patches[k][0], patches[k][1]
                 if start == end: # as a point
-                    if other_start < start and start < other_end:
-                        is_contained = True
-                        break
+                    if (strict_best_end is not None and strict_best_end > start) or start in seen_points:
+                        keep[k] = False
+                    seen_points.add(start)
                 else:
-                    if other_start <= start and end <= other_end:
-                        is_contained = True
-                        break
-            
-            if not is_contained:
-                filtered_patches.append(current_patch)
+                    max_other_end = best_end if best_idx != k else second_end
+                    if max_other_end is not None and end <= max_other_end:
+                        keep[k] = False
+            g = group_end
+
+        filtered_patches = [patch for k, patch in enumerate(patches) if keep[k]]
 
-        filtered_patches.sort(reverse=True, key=lambda x: x[0])
+        filtered_patches.sort(reverse=True, key=itemgetter(0))
 
-        for start, end, replacement in filtered_patches:
-            source_code = source_code[:start] + replacement + source_code[end:]
-        return source_code
\ No newline at end of file
+        # patch的起止是tree-sitter的字节偏移, 代码含非ASCII字符时与str下标不同, 在UTF-8编码上拼接
+        if not source_code.isascii():
+            encoded_patches = [(start, end, replacement.encode("utf8")) for start, end, replacement in filtered_patches]
+            return _splice(source_code.encode("utf8"), encoded_patches).decode("utf8")
+        return _splice(source_code, filtered_patches)
\ No newline at end of file
@@ -1,7 +1,8 @@
 
 import logging
-from typing import List
+from typing import List, Union
 from .base import BaseMutator
+from src.utils import initialize_parser
 
 
 class MutatorChain:
@@ -18,12 +19,15 @@ class MutatorChain:
     
     def __init__(self):
         self.mutators: List[BaseMutator] = []
+        # 链中的转换器顺序执行, 共用一个tree-sitter parser (Parser.parse不在parser中保留语法树状态)
+        self.parser = initialize_parser()
         self.logger = logging.getLogger("mutator-chain")
         self.logger.setLevel(logging.INFO)
 
     def register(self, mutator: BaseMutator) -> 'MutatorChain':
         if not isinstance(mutator, BaseMutator):
             raise TypeError("mutator must be an instance of BaseMutator")
+        mutator.parser = self.parser
         self.mutators.append(mutator)
         return self
     
@@ -32,32 +36,49 @@ class MutatorChain:
             self.register(mutator)
         return self
     
-    def transform(self, source_code: str) -> str:
+    def transform(self, source_code: Union[str, bytes]) -> Union[str, bytes]:
         """
         大小迭代嵌套转换器链
         
         Args:
-            source_code: 原始shell代码
+            source_code: 原始shell代码 (str, 或UTF-8编码的bytes)
                 
         Returns:
-            转换后的shell代码
+            转换后的shell代码, 与输入类型相同
         """
+        if isinstance(source_code, bytes):
+            return self.transform(source_code.decode("utf-8")).encode("utf-8")
+
         result = source_code
         context = {} 
         
         curr_round = 0
         max_round = 10  # 防止无限循环
         prev_result = None
+        # 每个转换器上次没有改变的代码: 代码未变时再次运行也不会改变, 直接跳过 (比较时相同对象/长度不同都是O(1))
+        unchanged_inputs = [None] * len(self.mutators)
         while result != prev_result and curr_round < max_round:
             prev_result = result
             curr_round += 1
             
             self.logger.debug(f"begin iteration round [ {curr_round} ] ....")
-            for _, mutator in enumerate(self.mutators):
+            changed = False
+            for i, mutator in enumerate(self.mutators):
+                if unchanged_inputs[i] == result:
+                    continue
+                # 代码中没有该转换器处理的语法, 不必解析和遍历AST
+                if mutator.TRIGGER_PATTERN is not None and not mutator.TRIGGER_PATTERN.search(result):
+                    continue
                 before_transform = result
                 result, context = mutator.transform(result, context)
                 if before_transform != result:
+                    changed = True
                     self.logger.debug(f"apply mutator [ {mutator.__class__.__name__} ]")
+                else:
+                    unchanged_inputs[i] = result
+            # 没有转换器改变代码, 已稳定, 不必再比较整段代码
+            if not changed:
+                break
             
         if curr_round >= max_round:
             self.logger.warning("Maximum iteration reached, possible infinite loop.")
@@ -3,12 +3,40 @@ from src.mutation_chain import BaseMutator
 import tree_sitter
 import re
 
+_NAME = r'[a-zA-Z_][a-zA-Z0-9_]*'
+# 每次访问节点都会用到的正则, 在模块加载时编译一次
+COMPOUND_RE = re.compile(r'\(\(\s*(.*?)\s*\)\)')             # (( ... ))
+ARITH_RE = re.compile(r'\$\(\(\s*(.*?)\s*\)\)')             # $(( ... ))
+# i++, i-- 或 ++i, --i: 一次匹配, 由匹配到的分组区分
+INC_DEC_RE = re.compile(rf'^(?:({_NAME})(\+\+|\-\-)|(\+\+|\-\-)({_NAME}))$')
+POWER_RE = re.compile(rf'(\d+|\${_NAME})\s*\*\*\s*(\d+)')
+SHIFT_LEFT_RE = re.compile(rf'(\d+|\${_NAME})\s*<<\s*(\d+)')
+SHIFT_RIGHT_RE = re.compile(rf'(\d+|\${_NAME})\s*>>\s*(\d+)')
+HEX_RE = re.compile(r'0x([0-9a-fA-F]+)')
+COMPOUND_ASSIGN_RE = re.compile(rf'({_NAME})\s*(\+=|-=|\*=|/=|%=|<<=|>>=|&=|\^=|\|=)\s*(.*)')
+AND_SPLIT_RE = re.compile(r'\s*&&\s*')
+OR_SPLIT_RE = re.compile(r'\s*\|\|\s*')
+VAR_RE = re.compile(rf'^{_NAME}$')
+ASSIGN_RE = re.compile(rf'({_NAME})\s*=\s*(.*)')
+
+CONDITION_STATEMENT_TYPES = frozenset(("if_statement", "while_statement"))
+
+
+def _times_pow2(operand: str, shift: int) -> str:
+    """operand << shift 的POSIX写法: 乘以常数 2^shift"""
+    return f"{operand} * {1 << shift}" if shift > 0 else operand
+
+def _div_pow2(operand: str, shift: int) -> str:
+    """operand >> shift 的POSIX写法: 除以常数 2^shift (连续整除2与一次整除2^shift结果相同)"""
+    return f"({operand} / {1 << shift})" if shift > 0 else f"({operand})"
+
 class ArithmeticExpansionMutator(BaseMutator):
     """将Bash中的算术扩展(ArithmeticExpansion)语法转换为POSIX兼容语法"""
     
     NAME = "arithmetic_expansion_mutator"
     DESCRIPTION = "将Bash算术扩展(ArithmeticExpansion)转换为POSIX兼容语法"
     TARGET_FEATURES = {"arithmetic_expansion"}
+    TRIGGER_PATTERN = r"\(\(|\$\["  # $(( )), (( )) 语句, 以及旧式 $[ ]
     
     # 定义所有与算术扩展相关的节点类型
     target_node_types = [
@@ -32,33 +60,32 @@ class ArithmeticExpansionMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
-        # 遍历AST，收集所有目标节点
-        def _traverse(node: tree_sitter.Node):
-            if node.type in self.target_node_types:
+        # 遍历AST(先序)，收集所有目标节点
+        # 已遍历到的if/while的条件部分的字节范围: 先序遍历中祖先先于子孙, 节点的条件上下文都已记录
+        cond_spans = []
+        if root:
+            for node in self.iter_nodes(root):
+                if node.type in CONDITION_STATEMENT_TYPES:
+                    cond_spans.extend(
+                        (child.start_byte, child.end_byte) for child in node.children if child.type == "condition"
+                    )
+                    continue
+                if node.type not in self.target_node_types:
+                    continue
                 # 检查如果是compound_statement，确保它是算术扩展
                 if node.type == "compound_statement":
                     # 判断是否为算术语句 (( ... ))
-                    node_text = source_code[node.start_byte:node.end_byte]
+                    node_text = node.text.decode("utf8")
                     if not node_text.strip().startswith('((') or not node_text.strip().endswith('))'):
-                        for child in node.children:
-                            _traverse(child)
-                        return
+                        continue
                 
                 # 生成POSIX等效代码，并记录替换位置
-                posix_code = self._generate_posix_code(node, source_code)
+                posix_code = self._generate_posix_code(node, source_code, cond_spans)
                 if posix_code is not None:  # 只有生成了新代码才添加补丁
                     patches.append((node.start_byte, node.end_byte, posix_code))
-            
-            # 继续遍历子节点
-            for child in node.children:
-                _traverse(child)
-        
-        # 执行遍历
-        if root:
-            _traverse(root)
         
         # 更新上下文信息
         transformed_features = context.get('transformed_features', set())
@@ -68,9 +95,9 @@ class ArithmeticExpansionMutator(BaseMutator):
         # 应用补丁并返回结果
         return self.apply_patches(source_code, patches), context
     
-    def _generate_posix_code(self, node: tree_sitter.Node, source_code: str) -> str:
+    def _generate_posix_code(self, node: tree_sitter.Node, source_code: str, cond_spans: List[Tuple[int, int]]) -> str:
         """根据具体节点生成POSIX代码"""
-        node_text = source_code[node.start_byte:node.end_byte]
+        node_text = node.text.decode("utf8")
         
         # 是否为独立的算术语句 (( ... ))
         is_compound_statement = node.type == "compound_statement"
@@ -78,31 +105,24 @@ class ArithmeticExpansionMutator(BaseMutator):
         # 提取算术表达式内容
         if is_compound_statement:
             # 从 (( ... )) 提取内部表达式
-            match = re.match(r'\(\(\s*(.*?)\s*\)\)', node_text)
+            match = COMPOUND_RE.match(node_text)
             if not match:
                 return None  # 不是算术扩展
             expr = match.group(1)
         else:  # arithmetic_expansion: $(( ... ))
             # 从 $(( ... )) 提取内部表达式
-            match = re.match(r'\$\(\(\s*(.*?)\s*\)\)', node_text)
+            match = ARITH_RE.match(node_text)
             if not match:
                 return None
             expr = match.group(1)
+        # 两端的空白已被 \s* 吸收, expr 不必再 strip
         
         # 处理独立的自增/自减操作: (( i++ )), (( i-- )), (( ++i )), (( --i ))
-        inc_dec_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)(\+\+|\-\-)$', expr.strip())
+        inc_dec_match = INC_DEC_RE.match(expr)
         if inc_dec_match:
-            var_name, operator = inc_dec_match.groups()
-            operation = '+' if operator == '++' else '-'
-            if is_compound_statement:
-                return f"{var_name}=$(({var_name} {operation} 1))"
-            else:
-                return f"$(({var_name} {operation} 1))"
-        
-        pre_inc_dec_match = re.match(r'^(\+\+|\-\-)([a-zA-Z_][a-zA-Z0-9_]*)$', expr.strip())
-        if pre_inc_dec_match:
-            operator, var_name = pre_inc_dec_match.groups()
-            operation = '+' if operator == '++' else '-'
+            post_var, post_op, pre_op, pre_var = inc_dec_match.groups()
+            var_name = post_var or pre_var
+            operation = '+' if (post_op or pre_op) == '++' else '-'
             if is_compound_statement:
                 return f"{var_name}=$(({var_name} {operation} 1))"
             else:
@@ -111,16 +131,14 @@ class ArithmeticExpansionMutator(BaseMutator):
         # 处理幂运算 **: a ** b (转换为多个乘法，或使用 bc)
         if '**' in expr:
             # 首先用简单的正则表达式处理较简单的格式
-            power_match = re.search(r'(\d+|\$[a-zA-Z_][a-zA-Z0-9_]*)\s*\*\*\s*(\d+)', expr)
+            power_match = POWER_RE.search(expr)
             if power_match:
                 base, exp = power_match.groups()
                 try:
                     # 如果是数字指数，展开成多个乘法
                     exp_value = int(exp)
                     if exp_value <= 10:  # 限制展开大小
-                        replacement = base
-                        for i in range(exp_value - 1):
-                            replacement += f" * {base}"
+                        replacement = " * ".join([base] * max(exp_value, 1))
                         new_expr = expr[:power_match.start()] + replacement + expr[power_match.end():]
                         if is_compound_statement:
                             return f"(({new_expr}))"
@@ -132,16 +150,14 @@ class ArithmeticExpansionMutator(BaseMutator):
         # 处理位移操作: << and >>
         if '<<' in expr or '>>' in expr:
             # 尝试替换位移操作符为乘法/除法表达式
-            shift_left_match = re.search(r'(\d+|\$[a-zA-Z_][a-zA-Z0-9_]*)\s*<<\s*(\d+)', expr)
+            shift_left_match = SHIFT_LEFT_RE.search(expr)
             if shift_left_match:
                 base, shift = shift_left_match.groups()
                 try:
                     shift_value = int(shift)
                     if shift_value <= 20:  # 限制展开大小
-                        # 实现 "1 << 3" 为 "1 * 2 * 2 * 2" (2^3)
-                        replacement = base
-                        for i in range(shift_value):
-                            replacement += " * 2"
+                        # 实现 "1 << 3" 为 "1 * 8" (2^3)
+                        replacement = _times_pow2(base, shift_value)
                         new_expr = expr[:shift_left_match.start()] + replacement + expr[shift_left_match.end():]
                         if is_compound_statement:
                             return f"(({new_expr}))"
@@ -150,17 +166,14 @@ class ArithmeticExpansionMutator(BaseMutator):
                 except ValueError:
                     pass
             
-            shift_right_match = re.search(r'(\d+|\$[a-zA-Z_][a-zA-Z0-9_]*)\s*>>\s*(\d+)', expr)
+            shift_right_match = SHIFT_RIGHT_RE.search(expr)
             if shift_right_match:
                 base, shift = shift_right_match.groups()
                 try:
                     shift_value = int(shift)
                     if shift_value <= 20:  # 限制展开大小
-                        # 实现 "8 >> 2" 为 "(8 / 2 / 2)" (除以2^2)
-                        replacement = f"({base}"
-                        for i in range(shift_value):
-                            replacement += " / 2"
-                        replacement += ")"
+                        # 实现 "8 >> 2" 为 "(8 / 4)" (除以2^2)
+                        replacement = _div_pow2(base, shift_value)
                         new_expr = expr[:shift_right_match.start()] + replacement + expr[shift_right_match.end():]
                         if is_compound_statement:
                             return f"(({new_expr}))"
@@ -169,15 +182,12 @@ class ArithmeticExpansionMutator(BaseMutator):
                 except ValueError:
                     pass
         
-        # 处理十六进制字面量: 0x10 -> 16#10
-        def replace_hex_literal(match):
-            hex_value = match.group(1)
-            return f"16#{hex_value}"
-        
-        expr = re.sub(r'0x([0-9a-fA-F]+)', replace_hex_literal, expr)
+        # 处理十六进制字面量: 0x10 -> 16#10 (模板替换由C实现完成, 不必每次匹配回调Python函数)
+        if '0x' in expr:
+            expr = HEX_RE.sub(r'16#\1', expr)
         
         # 处理复合赋值操作符: +=, -=, *=, /=, %=, <<=, >>=, &=, ^=, |=
-        compound_assign_match = re.search(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*(\+=|-=|\*=|/=|%=|<<=|>>=|&=|\^=|\|=)\s*(.*)', expr)
+        compound_assign_match = COMPOUND_ASSIGN_RE.search(expr) if '=' in expr else None
         if compound_assign_match:
             var_name, operator, value = compound_assign_match.groups()
             simple_op = operator[0]  # 提取基本操作符
@@ -187,9 +197,7 @@ class ArithmeticExpansionMutator(BaseMutator):
                 try:
                     shift_value = int(value.strip())
                     if shift_value <= 20:  # 限制展开大小
-                        replacement = f"{var_name} = {var_name}"
-                        for i in range(shift_value):
-                            replacement += " * 2"
+                        replacement = f"{var_name} = {_times_pow2(var_name, shift_value)}"
                         if is_compound_statement:
                             return f"{var_name}=$(({replacement}))"
                         else:
@@ -200,10 +208,7 @@ class ArithmeticExpansionMutator(BaseMutator):
                 try:
                     shift_value = int(value.strip())
                     if shift_value <= 20:  # 限制展开大小
-                        replacement = f"{var_name} = ({var_name}"
-                        for i in range(shift_value):
-                            replacement += " / 2"
-                        replacement += ")"
+                        replacement = f"{var_name} = {_div_pow2(var_name, shift_value)}"
                         if is_compound_statement:
                             return f"{var_name}=$(({replacement}))"
                         else:
@@ -218,15 +223,15 @@ class ArithmeticExpansionMutator(BaseMutator):
                     return f"$(({new_expr}))"
         
         # 处理算术if条件: if (( a && b )) -> if [ "$a" -ne 0 ] && [ "$b" -ne 0 ]
-        if is_compound_statement and self._is_condition_context(node, source_code):
+        if is_compound_statement and self._is_condition_context(node, cond_spans):
             # 处理 && 逻辑与
             if '&&' in expr:
-                parts = re.split(r'\s*&&\s*', expr)
+                parts = AND_SPLIT_RE.split(expr)
                 posix_parts = []
                 
                 for part in parts:
                     # 如果是变量或比较表达式
-                    if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', part.strip()):
+                    if VAR_RE.match(part.strip()):
                         # 单个变量检查非零
                         posix_parts.append(f'[ "${part.strip()}" -ne 0 ]')
                     else:
@@ -237,11 +242,11 @@ class ArithmeticExpansionMutator(BaseMutator):
             
             # 处理 || 逻辑或
             elif '||' in expr:
-                parts = re.split(r'\s*\|\|\s*', expr)
+                parts = OR_SPLIT_RE.split(expr)
                 posix_parts = []
                 
                 for part in parts:
-                    if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', part.strip()):
+                    if VAR_RE.match(part.strip()):
                         posix_parts.append(f'[ "${part.strip()}" -ne 0 ]')
                     else:
                         posix_parts.append(f'[ "$(({part}))" -ne 0 ]')
@@ -249,8 +254,8 @@ class ArithmeticExpansionMutator(BaseMutator):
                 return " || ".join(posix_parts)
             
             # 处理简单变量条件: if (( var )) -> if [ "$var" -ne 0 ]
-            elif re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', expr.strip()):
-                return f'[ "${expr.strip()}" -ne 0 ]'
+            elif VAR_RE.match(expr):
+                return f'[ "${expr}" -ne 0 ]'
             
             # 其他复杂条件表达式
             else:
@@ -259,7 +264,7 @@ class ArithmeticExpansionMutator(BaseMutator):
         # 默认情况：保持原始格式，但使用POSIX兼容语法
         if is_compound_statement:
             # 检查独立表达式是否是赋值
-            assign_match = re.match(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.*)', expr)
+            assign_match = ASSIGN_RE.match(expr)
             if assign_match:
                 var_name, value = assign_match.groups()
                 return f"{var_name}=$(({expr}))"
@@ -268,15 +273,7 @@ class ArithmeticExpansionMutator(BaseMutator):
         else:
             return f"$(({expr}))"
     
-    def _is_condition_context(self, node: tree_sitter.Node, source_code: str) -> bool:
-        """检查节点是否在条件语句（如if, while）的上下文中"""
-        # 向上查找父节点
-        current = node.parent
-        while current:
-            if current.type == "if_statement" or current.type == "while_statement":
-                # 检查当前节点是否是条件部分
-                for child in current.children:
-                    if child.type == "condition" and node.start_byte >= child.start_byte and node.end_byte <= child.end_byte:
-                        return True
-            current = current.parent
-        return False
\ No newline at end of file
+    def _is_condition_context(self, node: tree_sitter.Node, cond_spans: List[Tuple[int, int]]) -> bool:
+        """检查节点是否在条件语句（如if, while）的上下文中, 即在某个条件部分的字节范围内"""
+        start, end = node.start_byte, node.end_byte
+        return any(cond_start <= start and end <= cond_end for cond_start, cond_end in cond_spans)
\ No newline at end of file
@@ -1,12 +1,14 @@
 from src.mutation_chain import BaseMutator
 import tree_sitter
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Dict, Optional, Set, Tuple, List
 
 class ArrayMutator(BaseMutator):
     # 定义转换器基本信息
     NAME = "array_mutator"
     DESCRIPTION = "将Bash Array 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"Array"}
+    # 数组声明/追加 =( +=(, 其余的处理(元素赋值, 下标访问, 数组扩展)都需要subscript节点, 即 [
+    TRIGGER_PATTERN = r"=\s*\(|\["
     
     # 目标节点类型：数组声明、数组操作、数组引用等
     target_node_types = [
@@ -33,27 +35,27 @@ class ArrayMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
-        # 首先识别所有数组声明
-        self._identify_arrays(root, source_code, context)
+        # 识别数组与处理目标节点在同一次先序遍历中完成: 节点处理时用到的数组名都由该节点自身或其父节点登记, 
+        # 上下文中原本没有数组记录时, 与先完整识别一遍再处理的结果相同
+        # 上下文中已有(之前的转换记录的)数组时, 后面的声明要在处理前就重置旧记录, 仍先完整识别一遍
+        registered = None
+        if context['arrays']:
+            self._identify_arrays(root, source_code, context)
+        else:
+            registered = set()
 
-        # 遍历AST处理所有目标节点
-        def _traverse(node: tree_sitter.Node):
-            # 先处理节点自身
-            if node.type in self.target_node_types:
-                patch = self._process_node(node, source_code, context)
-                if patch:
-                    patches.extend(patch)
-            
-            # 再递归处理子节点
-            for child in node.children:
-                _traverse(child)
-        
-        # 执行遍历
+        # 遍历AST(先序)处理所有目标节点
         if root:
-            _traverse(root)
+            for node in self.iter_nodes(root):
+                if registered is not None:
+                    self._register_arrays(node, context, registered)
+                if node.type in self.target_node_types:
+                    patch = self._process_node(node, source_code, context)
+                    if patch:
+                        patches.extend(patch)
         
         # 更新上下文信息
         transformed_features = context.get('transformed_features', set())
@@ -65,44 +67,49 @@ class ArrayMutator(BaseMutator):
     
     def _identify_arrays(self, root_node: tree_sitter.Node, source_code: str, context: Dict[str, Any]):
         """识别代码中的数组声明，并记录到上下文中"""
-        def _traverse(node):
-            if node.type == "variable_assignment":
-                # 检查是否为数组声明
-                for child in node.children:
-                    if child.type == "array":
-                        # 获取数组名称
-                        name_node = node.child_by_field_name("name")
-                        if name_node:
-                            array_name = source_code[name_node.start_byte:name_node.end_byte]
-                            context['arrays'][array_name] = {'is_array': True, 'length': 0}
-                
-                # 检查是否为下标赋值形式：arr[0]="value"
-                name_node = node.child_by_field_name("name")
-                if name_node and name_node.type == "subscript":
-                    # 获取数组名
-                    array_name_node = name_node.child_by_field_name("name")
-                    if array_name_node:
-                        array_name = source_code[array_name_node.start_byte:array_name_node.end_byte]
-                        # 如果数组不存在，则添加到上下文
-                        if array_name not in context['arrays']:
-                            context['arrays'][array_name] = {'is_array': True, 'length': 0}
-            
-            # 识别expansion中的subscript也作为数组的使用
-            elif node.type == "expansion":
-                for child in node.children:
-                    if child.type == "subscript":
-                        name_node = child.child_by_field_name("name")
-                        if name_node:
-                            array_name = source_code[name_node.start_byte:name_node.end_byte]
-                            # 如果数组还未识别，添加到上下文中
-                            if array_name not in context['arrays']:
-                                context['arrays'][array_name] = {'is_array': True, 'length': 0}
+        for node in self.iter_nodes(root_node):
+            self._register_arrays(node, context)
+
+    def _register_arrays(self, node: tree_sitter.Node, context: Dict[str, Any], registered: Optional[Set[str]] = None):
+        """
+        记录一个节点声明或使用的数组: 数组声明重置记录, 其他使用只在数组不存在时添加
+        
+        registered: 本次遍历中已登记的数组名, 已登记的不再重复处理(记录可能已被之前的节点处理更新)
+        """
+        def _register(array_name: str, declared: bool):
+            if registered is not None:
+                if array_name in registered:
+                    return
+                registered.add(array_name)
+            if declared or array_name not in context['arrays']:
+                context['arrays'][array_name] = {'is_array': True, 'length': 0}
 
-            # 递归处理子节点
+        if node.type == "variable_assignment":
+            # 检查是否为数组声明
             for child in node.children:
-                _traverse(child)
+                if child.type == "array":
+                    # 获取数组名称
+                    name_node = node.child_by_field_name("name")
+                    if name_node:
+                        _register(name_node.text.decode("utf8"), True)
+            
+            # 检查是否为下标赋值形式：arr[0]="value"
+            name_node = node.child_by_field_name("name")
+            if name_node and name_node.type == "subscript":
+                # 获取数组名
+                array_name_node = name_node.child_by_field_name("name")
+                if array_name_node:
+                    # 如果数组不存在，则添加到上下文
+                    _register(array_name_node.text.decode("utf8"), False)
         
-        _traverse(root_node)
+        # 识别expansion中的subscript也作为数组的使用
+        elif node.type == "expansion":
+            for child in node.children:
+                if child.type == "subscript":
+                    name_node = child.child_by_field_name("name")
+                    if name_node:
+                        # 如果数组还未识别，添加到上下文中
+                        _register(name_node.text.decode("utf8"), False)
     
     def _process_node(self, node: tree_sitter.Node, source_code: str, context: Dict[str, Any]) -> List[Tuple[int, int, str]]:
         """根据节点类型处理不同的数组操作"""
@@ -122,9 +129,9 @@ class ArrayMutator(BaseMutator):
                 patches.extend(self._handle_array_subscript(parent, source_code, context))
             
         elif node.type == "expansion":
-            # 检查是否为数组扩展（长度或遍历）
-            text = source_code[node.start_byte:node.end_byte]
-            if "@" in text or "*" in text:
+            # 检查是否为数组扩展（长度或遍历）, 直接在节点的字节上查找, 不必解码
+            text = node.text
+            if b"@" in text or b"*" in text:
                 # 处理数组扩展: ${arr[@]} 或 ${#arr[@]}
                 patches.extend(self._handle_array_expansion(node, source_code, context))
         
@@ -135,14 +142,9 @@ class ArrayMutator(BaseMutator):
                 # 处理数组元素赋值: arr[2]="d"
                 patches.extend(self._handle_array_element_assignment(node, source_code, context))
             else:
-                # 检查是否为数组追加: arr+=("d")
-                operator_node = None
-                for child in node.children:
-                    if child.type == "+=":
-                        operator_node = child
-                        break
-                
-                if operator_node and any(child.type == "array" for child in node.children):
+                # 检查是否为数组追加: arr+=("d"), 子节点类型只取一次
+                child_types = [child.type for child in node.children]
+                if "+=" in child_types and "array" in child_types:
                     # 处理数组追加操作
                     patches.extend(self._handle_array_append(node, source_code, context))
 
@@ -156,7 +158,7 @@ class ArrayMutator(BaseMutator):
         if not name_node:
             return []
         
-        array_name = source_code[name_node.start_byte:name_node.end_byte]
+        array_name = name_node.text.decode("utf8")
         
         # 获取数组元素
         array_node = None
@@ -169,16 +171,11 @@ class ArrayMutator(BaseMutator):
             return []
         
         # 解析数组元素
-        elements = []
-        for child in array_node.children:
-            if child.type != "(" and child.type != ")":
-                elements.append(source_code[child.start_byte:child.end_byte])
+        elements = [child.text.decode("utf8") for child in array_node.children if child.type != "(" and child.type != ")"]
 
         # 生成POSIX兼容代码
-        posix_code = []
-        posix_code.append(f"{array_name}__len={len(elements)};")
-        for i, element in enumerate(elements):
-            posix_code.append(f"{array_name}_{i}={element};")
+        posix_code = [f"{array_name}__len={len(elements)};"]
+        posix_code.extend([f"{array_name}_{i}={element};" for i, element in enumerate(elements)])
         
         
         # 记录数组信息到上下文
@@ -198,7 +195,7 @@ class ArrayMutator(BaseMutator):
         
         for child in node.children:
             if child.type == "operator":
-                operator = source_code[child.start_byte:child.end_byte]
+                operator = child.text.decode("utf8")
             elif child.type == "subscript":
                 subscript_node = child
         
@@ -210,14 +207,14 @@ class ArrayMutator(BaseMutator):
         if not name_node:
             return []
         
-        array_name = source_code[name_node.start_byte:name_node.end_byte]
+        array_name = name_node.text.decode("utf8")
         
         # 获取索引
         index_node = subscript_node.child_by_field_name("index")
         if not index_node:
             return []
         
-        index_text = source_code[index_node.start_byte:index_node.end_byte]
+        index_text = index_node.text.decode("utf8")
         
         # 处理数字索引
         if index_node.type == "number":
@@ -229,8 +226,6 @@ class ArrayMutator(BaseMutator):
     
     def _handle_array_expansion(self, node: tree_sitter.Node, source_code: str, context: Dict[str, Any]) -> List[Tuple[int, int, str]]:
         """处理数组扩展 ${arr[@]}, ${#arr[@]}, ${arr[*]}"""
-        text = source_code[node.start_byte:node.end_byte]
-        
         # 查找操作符和subscript节点
         operator = None
         subscript_node = None
@@ -248,14 +243,14 @@ class ArrayMutator(BaseMutator):
         if not name_node:
             return []
         
-        array_name = source_code[name_node.start_byte:name_node.end_byte]
+        array_name = name_node.text.decode("utf8")
         
         # 获取索引
         index_node = subscript_node.child_by_field_name("index")
         if not index_node:
             return []
         
-        index_text = source_code[index_node.start_byte:index_node.end_byte]
+        index_text = index_node.text.decode("utf8")
 
         # 处理数组长度 ${#arr[@]} - 即使数组未定义也返回0
         if operator == "#" and (index_text == "@" or index_text == "*"):
@@ -275,11 +270,8 @@ class ArrayMutator(BaseMutator):
                 return [(node.start_byte, node.end_byte, empty_string)]
             
             # 构建所有元素的展开
-            elements = []
             array_len = context['arrays'][array_name].get('length', 0)
-            
-            for i in range(array_len):
-                elements.append(f"${array_name}_{i}")
+            elements = [f"${array_name}_{i}" for i in range(array_len)]
             
             if elements:
                 # 检查是否在for循环的in后面
@@ -311,21 +303,21 @@ class ArrayMutator(BaseMutator):
         if not array_name_node:
             return []
         
-        array_name = source_code[array_name_node.start_byte:array_name_node.end_byte]
+        array_name = array_name_node.text.decode("utf8")
         
         # 获取索引
         index_node = name_node.child_by_field_name("index")
         if not index_node:
             return []
         
-        index_text = source_code[index_node.start_byte:index_node.end_byte]
+        index_text = index_node.text.decode("utf8")
         
         # 获取赋值表达式
         value_node = node.child_by_field_name("value")
         if not value_node:
             return []
         
-        value_text = source_code[value_node.start_byte:value_node.end_byte]
+        value_text = value_node.text.decode("utf8")
         
         # 如果数组不存在于上下文中，则添加
         if array_name not in context['arrays']:
@@ -354,7 +346,7 @@ class ArrayMutator(BaseMutator):
         if not name_node:
             return []
         
-        array_name = source_code[name_node.start_byte:name_node.end_byte]
+        array_name = name_node.text.decode("utf8")
         
         # 如果数组不存在于上下文中，则添加
         if array_name not in context['arrays']:
@@ -366,23 +358,17 @@ class ArrayMutator(BaseMutator):
             return []
         
         # 解析要追加的元素 - 收集除了括号以外的所有节点作为元素
-        elements = []
-        for child in value_node.children:
-            # 排除括号，接受任何其他类型（包括数字、命令替换等）
-            if child.type != "(" and child.type != ")":
-                elements.append(source_code[child.start_byte:child.end_byte])
+        # 排除括号，接受任何其他类型（包括数字、命令替换等）
+        elements = [child.text.decode("utf8") for child in value_node.children if child.type != "(" and child.type != ")"]
         
         if not elements:
             return []
         
         # 生成追加元素的代码
-        posix_code_lines = []
         current_len = context['arrays'][array_name].get('length', 0)
         
-        posix_code_lines.append(f"{array_name}__len=$(({current_len} + {len(elements)}))")
-        for i, element in enumerate(elements):
-            new_index = current_len + i
-            posix_code_lines.append(f"{array_name}_{new_index}={element}")
+        posix_code_lines = [f"{array_name}__len=$(({current_len} + {len(elements)}))"]
+        posix_code_lines.extend([f"{array_name}_{i}={element}" for i, element in enumerate(elements, current_len)])
         
         # 更新上下文中的长度
         context['arrays'][array_name]['length'] = current_len + len(elements)
@@ -7,6 +7,7 @@ class BraceExpansionMutator(BaseMutator):
     NAME = "brace_expansion_mutator"
     DESCRIPTION = "将Bash BraceExpansion 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"BraceExpansion"}
+    TRIGGER_PATTERN = r"\{"
     
     # In tree-sitter-bash, brace expansions have this node type
     target_node_types = ["brace_expression"]
@@ -26,7 +27,7 @@ class BraceExpansionMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，查找所有目标节点
@@ -44,7 +45,7 @@ class BraceExpansionMutator(BaseMutator):
         """递归遍历AST，收集所有需要替换的节点"""
         if node.type in self.target_node_types:
             # 检查这是否为我们要处理的数字序列格式 {a..b}
-            node_text = source_code[node.start_byte:node.end_byte]
+            node_text = node.text.decode("utf8")
             posix_code = self._generate_posix_code(node, node_text)
             if posix_code:  # 只有成功生成POSIX代码时才添加补丁
                 patches.append((node.start_byte, node.end_byte, posix_code))
@@ -7,6 +7,7 @@ class ConditionalExpressionsMutator(BaseMutator):
     NAME = "conditional_expression_mutator"
     DESCRIPTION = "将Bash条件表达式 [[ ]] 转换为POSIX兼容语法 [ ]"
     TARGET_FEATURES = {"ConditionalExpressions"}
+    TRIGGER_PATTERN = r"\[\["
     
     # 在tree-sitter-bash中，[[...]] 表达式被解析为test_command节点
     target_node_types = ["test_command"]
@@ -26,13 +27,13 @@ class ConditionalExpressionsMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，找到所有的 [[ ]] 条件表达式
         def _traverse(node: tree_sitter.Node):
             if node.type in self.target_node_types:
-                node_text = source_code[node.start_byte:node.end_byte].strip()
+                node_text = node.text.decode("utf8").strip()
                 if node_text.startswith("[[") and node_text.endswith("]]"):
                     posix_code = self._convert_to_posix(node, source_code)
                     patches.append((node.start_byte, node.end_byte, posix_code))
@@ -52,12 +53,12 @@ class ConditionalExpressionsMutator(BaseMutator):
     
     def _convert_to_posix(self, node: tree_sitter.Node, source_code: str) -> str:
         """将单个 [[ ]] 条件表达式转换为POSIX语法"""
-        expr_text = source_code[node.start_byte:node.end_byte]
+        expr_text = node.text.decode("utf8")
         inner_expr = expr_text[2:-2].strip()  # 去掉 [[ 和 ]]
 
         # 检查是否包含regex匹配 (=~)
         for child in node.children:
-            if child.type == "binary_expression" and "=~" in source_code[child.start_byte:child.end_byte]:
+            if child.type == "binary_expression" and "=~" in child.text.decode("utf8"):
                 return self._convert_regex_match_from_node(child, source_code)
         
         # 处理括号分组和逻辑操作符的复杂表达式
@@ -84,14 +85,14 @@ class ConditionalExpressionsMutator(BaseMutator):
             # 获取!后面的实际表达式
             if unary_node.child_count > 1:  # 确保有足够的子节点
                 expr_node = unary_node.children[1]  # !后面的表达式
-                left_expr = source_code[expr_node.start_byte:expr_node.end_byte]
+                left_expr = expr_node.text.decode("utf8")
         else:
-            left_expr = source_code[node.child_by_field_name("left").start_byte:node.child_by_field_name("left").end_byte]
+            left_expr = node.child_by_field_name("left").text.decode("utf8")
         
         # 获取右侧的正则表达式
         right_node = node.child_by_field_name("right")
         if right_node:
-            pattern = source_code[right_node.start_byte:right_node.end_byte]
+            pattern = right_node.text.decode("utf8")
         
         # 确保变量引用有引号
         quoted_left = self._ensure_quoted(left_expr)
@@ -160,28 +161,26 @@ class ConditionalExpressionsMutator(BaseMutator):
     
     def _split_considering_brackets(self, expr: str, delimiter: str) -> List[str]:
         """考虑括号嵌套的情况下分割表达式"""
+        # 记录当前片段的起点并切片, 而不是逐字符拼接字符串
         result = []
-        current = ""
+        segment_start = 0
         depth = 0
         
         i = 0
         while i < len(expr):
             if expr[i] == '(':
                 depth += 1
-                current += expr[i]
             elif expr[i] == ')':
                 depth -= 1
-                current += expr[i]
-            elif expr[i:i+len(delimiter)] == delimiter and depth == 0:
-                result.append(current.strip())
-                current = ""
-                i += len(delimiter) - 1  # 跳过分隔符其余部分
-            else:
-                current += expr[i]
+            elif depth == 0 and expr.startswith(delimiter, i):
+                result.append(expr[segment_start:i].strip())
+                i += len(delimiter)  # 跳过分隔符
+                segment_start = i
+                continue
             i += 1
         
-        if current:
-            result.append(current.strip())
+        if segment_start < len(expr):
+            result.append(expr[segment_start:].strip())
         
         return result
     
@@ -3,10 +3,16 @@ from src.mutation_chain import BaseMutator
 import tree_sitter
 import re
 
+# 命令名直接按bytes比较, 不必对每个command节点的命令名做decode
+DIRSTACK_COMMANDS = frozenset((b"pushd", b"popd", b"dirs"))
+DIRSTACK_WORD_PATTERN = re.compile(r'^~[\+\-]\d+$')
+DIRSTACK_REF_PATTERN = re.compile(r'~[\+\-]\d+')
+
 class DirectoryStackMutator(BaseMutator):
     NAME = "directory_stack_mutator"
     DESCRIPTION = "将Bash DirectoryStack 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"DirectoryStack"}
+    TRIGGER_PATTERN = r"pushd|popd|dirs|~[+-]\d"
     
     # Directory stack operations and tilde expansion with directory references
     target_node_types = ["command", "expansion"]
@@ -27,7 +33,7 @@ class DirectoryStackMutator(BaseMutator):
         needs_dirstack_functions = False
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，收集所有目标节点
@@ -37,7 +43,7 @@ class DirectoryStackMutator(BaseMutator):
             if node.type == "command":
                 # 处理 pushd, popd, dirs 命令
                 command_name_node = node.child_by_field_name("name")
-                if command_name_node and command_name_node.text.decode('utf-8') in ["pushd", "popd", "dirs"]:
+                if command_name_node and command_name_node.text in DIRSTACK_COMMANDS:
                     posix_code = self._transform_directory_command(node, source_code)
                     if posix_code:
                         patches.append((node.start_byte, node.end_byte, posix_code))
@@ -46,8 +52,8 @@ class DirectoryStackMutator(BaseMutator):
                     # 处理命令参数中的目录栈引用
                     for child in node.children:
                         if child != command_name_node and child.type == "word":
-                            word_text = source_code[child.start_byte:child.end_byte]
-                            if re.search(r'^~[\+\-]\d+$', word_text):
+                            word_text = child.text.decode("utf8")
+                            if DIRSTACK_WORD_PATTERN.search(word_text):
                                 posix_code = self._transform_dirstack_expansion(child, source_code)
                                 if posix_code:
                                     patches.append((child.start_byte, child.end_byte, posix_code))
@@ -55,8 +61,8 @@ class DirectoryStackMutator(BaseMutator):
             
             elif node.type == "expansion":
                 # 处理目录栈引用，如 ~+3 或 ~-2
-                text = source_code[node.start_byte:node.end_byte]
-                if re.search(r'~[\+\-]\d+', text):
+                text = node.text.decode("utf8")
+                if DIRSTACK_REF_PATTERN.search(text):
                     posix_code = self._transform_dirstack_expansion(node, source_code)
                     if posix_code:
                         patches.append((node.start_byte, node.end_byte, posix_code))
@@ -93,7 +99,7 @@ class DirectoryStackMutator(BaseMutator):
             for child in node.children:
                 # 跳过命令名节点，只处理参数
                 if child != command_name_node and child.type != "comment":
-                    arg_text = source_code[child.start_byte:child.end_byte]
+                    arg_text = child.text.decode("utf8")
                     arguments.append(arg_text)
             
             if arguments:
@@ -111,7 +117,7 @@ class DirectoryStackMutator(BaseMutator):
     
     def _transform_dirstack_expansion(self, node: tree_sitter.Node, source_code: str) -> str:
         """转换目录栈引用表达式（~+N 或 ~-N）"""
-        text = source_code[node.start_byte:node.end_byte]
+        text = node.text.decode("utf8")
 
         # 匹配 ~+N 或 ~-N 模式
         match = re.search(r'~([\+\-])(\d+)', text)
@@ -6,6 +6,7 @@ class FunctionsMutator(BaseMutator):
     NAME = "functions_mutator"
     DESCRIPTION = "将Bash Functions 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"functions"}
+    TRIGGER_PATTERN = r"function|\((?:\s|\\\n)*\)"  # function 关键字, 或 name() 形式
     
     # 函数定义在tree-sitter-bash中是function_definition节点
     target_node_types = ["function_definition"]
@@ -25,7 +26,7 @@ class FunctionsMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，收集所有function_definition节点
@@ -48,7 +49,7 @@ class FunctionsMutator(BaseMutator):
                     # 确定函数声明结束位置（不包含函数体）
                     decl_end = body_node.start_byte
                     # 提取函数名
-                    function_name = source_code[name_node.start_byte:name_node.end_byte]
+                    function_name = name_node.text.decode("utf8")
                     # 生成POSIX兼容版本的函数声明
                     posix_decl = f"{function_name}() "
                     # 添加补丁，仅替换函数声明部分
@@ -6,6 +6,7 @@ class HereStringsMutator(BaseMutator):
     NAME = "here_string_mutator"
     DESCRIPTION = "将Bash HereString 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"herestring"}
+    TRIGGER_PATTERN = r"<<<"
     
     # 正确的节点类型应该是"herestring_redirect"而不是"here_string"
     target_node_types = ["herestring_redirect"]
@@ -26,7 +27,7 @@ class HereStringsMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，收集所有herestring_redirect节点
@@ -57,7 +58,7 @@ class HereStringsMutator(BaseMutator):
         string_content = None
         for child in node.children:
             if child.type == "string" or child.type == "raw_string":
-                string_content = source_code[child.start_byte:child.end_byte]
+                string_content = child.text.decode("utf8")
                 break
         
         if string_content is None:
@@ -144,11 +145,13 @@ class HereStringsMutator(BaseMutator):
     
     def _build_replacement(self, command_node, cmd_parts, string_content, redirects, is_pipeline, source_code):
         """构建替换代码"""
+        # cmd_parts/redirects 是tree-sitter的字节偏移, 在UTF-8编码上截取
+        source_bytes = source_code.encode("utf8")
         # 构建命令部分
-        cmd_text = " ".join([source_code[start:end] for start, end in cmd_parts])
+        cmd_text = " ".join([source_bytes[start:end].decode("utf8") for start, end in cmd_parts])
         
         # 构建重定向部分
-        redirect_text = " ".join([source_code[start:end] for start, end in redirects])
+        redirect_text = " ".join([source_bytes[start:end].decode("utf8") for start, end in redirects])
 
         # 构建基本替换
         replacement = f'printf "%s\\n" {string_content} | {cmd_text}'
@@ -160,7 +163,7 @@ class HereStringsMutator(BaseMutator):
         # 处理管道情况
         if is_pipeline:
             # 获取原代码
-            original_code = source_code[command_node.start_byte:command_node.end_byte]
+            original_code = command_node.text.decode("utf8")
             
             # 如果是管道的第一个命令
             if command_node.type == "pipeline":
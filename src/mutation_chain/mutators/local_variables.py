@@ -6,6 +6,7 @@ class LocalVariablesMutator(BaseMutator):
     NAME = "local_variables_mutator"
     DESCRIPTION = "将Bash Local Variables 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"local_variables"}
+    TRIGGER_PATTERN = r"\blocal\b"
     
     target_node_types = ["declaration_command"]
     
@@ -24,7 +25,7 @@ class LocalVariablesMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 更新上下文信息
@@ -6,6 +6,7 @@ class ProcessSubstitutionMutator(BaseMutator):
     NAME = "process_substitution_mutator"
     DESCRIPTION = "将Bash ProcessSubstitution 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"ProcessSubstitution"}
+    TRIGGER_PATTERN = r"[<>]\("
     
     target_node_types = ["process_substitution"]
     
@@ -48,7 +49,9 @@ class ProcessSubstitutionMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
+        # 节点位置是UTF-8字节偏移, 任意范围的文本在编码后的字节上截取
+        source_bytes = source_code.encode("utf8")
         root = ast.root_node
         
         # 收集所有输出ProcessSubstitution节点
@@ -107,7 +110,7 @@ class ProcessSubstitutionMutator(BaseMutator):
             
             if body_node and output_substitutions:
                 # 获取命令体文本
-                body_text = source_code[body_node.start_byte:body_node.end_byte]
+                body_text = body_node.text.decode("utf8")
                 
                 # 创建临时文件
                 context['tmp_counter'] += 1
@@ -123,7 +126,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                     # 提取进程替换中的命令序列
                     cmd_start = ps_node.children[0].end_byte  # >( 后面的位置
                     cmd_end = ps_node.children[-1].start_byte  # ) 前面的位置
-                    command_content = source_code[cmd_start:cmd_end].strip()
+                    command_content = source_bytes[cmd_start:cmd_end].decode("utf8").strip()
                     
                     if command_content:
                         suffix_code += f"( {command_content}; ) < \"${tmp_var}\"\n"
@@ -148,7 +151,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                         if not has_process_subst:
                             has_final_redirect = True
                             # 保存这个普通重定向用于后续处理
-                            final_redirect = source_code[child.start_byte:child.end_byte]
+                            final_redirect = child.text.decode("utf8")
                 
                 # 生成替换代码
                 replacement = prefix_code + suffix_code
@@ -163,7 +166,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                             break
                     
                     if pipe_start:
-                        pipe_text = source_code[pipe_start:parent_pipeline.end_byte]
+                        pipe_text = source_bytes[pipe_start:parent_pipeline.end_byte].decode("utf8")
                         replacement += pipe_text
                 
                 # 添加补丁，替换整个重定向语句
@@ -179,7 +182,9 @@ class ProcessSubstitutionMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
+        # 节点位置是UTF-8字节偏移, 任意范围的文本在编码后的字节上截取
+        source_bytes = source_code.encode("utf8")
         root = ast.root_node
         
         # 收集所有ProcessSubstitution节点
@@ -266,7 +271,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                 cmd_end = ps_node.children[-1].start_byte  # ) 前面的位置
                 
                 # 提取完整命令序列
-                command_content = source_code[cmd_start:cmd_end].strip()
+                command_content = source_bytes[cmd_start:cmd_end].decode("utf8").strip()
                 
                 if not command_content:
                     continue
@@ -293,7 +298,7 @@ class ProcessSubstitutionMutator(BaseMutator):
         # 处理pipeline
         for pipe_id, pipe_group in pipeline_groups.items():
             pipeline_node = pipe_group['node']
-            pipeline_text = source_code[pipeline_node.start_byte:pipeline_node.end_byte]
+            pipeline_text = pipeline_node.text.decode("utf8")
             
             # 为pipeline添加前缀代码
             prefix_code = ""
@@ -304,7 +309,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                 cmd_end = ps_node.children[-1].start_byte  # ) 前面的位置
                 
                 # 提取完整命令序列
-                command_content = source_code[cmd_start:cmd_end].strip()
+                command_content = source_bytes[cmd_start:cmd_end].decode("utf8").strip()
                 
                 if not command_content:
                     continue
@@ -332,7 +337,7 @@ class ProcessSubstitutionMutator(BaseMutator):
         # 处理redirected_statement
         for rs_id, rs_group in redirected_statement_groups.items():
             rs_node = rs_group['node']
-            redirected_text = source_code[rs_node.start_byte:rs_node.end_byte]
+            redirected_text = rs_node.text.decode("utf8")
             
             prefix_code = ""
             # 临时文件声明和创建在重定向语句前面
@@ -342,7 +347,7 @@ class ProcessSubstitutionMutator(BaseMutator):
                 cmd_end = ps_node.children[-1].start_byte  # ) 前面的位置
                 
                 # 提取完整命令序列
-                command_content = source_code[cmd_start:cmd_end].strip()
+                command_content = source_bytes[cmd_start:cmd_end].decode("utf8").strip()
                 
                 if not command_content:
                     continue
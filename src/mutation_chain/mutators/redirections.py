@@ -6,6 +6,7 @@ class RedirectionsMutator(BaseMutator):
     NAME = "redirection_mutator"
     DESCRIPTION = "将Bash Redirections 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"redirections"}
+    TRIGGER_PATTERN = r"&>"
     
     # 主要目标是redirected_statement节点
     target_node_types = ["redirected_statement"]
@@ -25,7 +26,7 @@ class RedirectionsMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，查找所有redirected_statement节点
@@ -80,8 +81,7 @@ class RedirectionsMutator(BaseMutator):
         
         for child in file_redirect_node.children:
             # 查找操作符 - 在AST中是直接的文本节点 "&>" 或 "&>>"
-            if not operator_node and (source_code[child.start_byte:child.end_byte] == "&>" or 
-                                     source_code[child.start_byte:child.end_byte] == "&>>"):
+            if not operator_node and child.text in (b"&>", b"&>>"):
                 operator_node = child
             
             # 查找目标文件 - destination或word节点
@@ -90,8 +90,8 @@ class RedirectionsMutator(BaseMutator):
         
         # 如果找到了操作符和目标文件
         if operator_node and destination_node:
-            op_text = source_code[operator_node.start_byte:operator_node.end_byte]
-            file_text = source_code[destination_node.start_byte:destination_node.end_byte]
+            op_text = operator_node.text.decode("utf8")
+            file_text = destination_node.text.decode("utf8")
             
             # 构建POSIX兼容的重定向
             if op_text == "&>":
@@ -5,6 +5,7 @@ class SpecialPipelineMutator(BaseMutator):
     NAME = "special_pipeline_mutator"
     DESCRIPTION = "将Bash Pipeline语法 |& 转换为 POSIX兼容的 2>&1 | 语法"
     TARGET_FEATURES = {"pipeline"}
+    TRIGGER_PATTERN = r"\|&"
     
     # 在Bash的tree-sitter语法中，|& 是一个具体的节点类型
     target_node_types = ["|&"]
@@ -24,7 +25,7 @@ class SpecialPipelineMutator(BaseMutator):
         patches = []
         
         # 解析AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # 遍历AST，收集所有 |& 节点
@@ -8,6 +8,7 @@ class VariableAssignmentMutator(BaseMutator):
     NAME = "variable_assignment_mutator"
     DESCRIPTION = "将Bash += 变量赋值和 declare -i 转换为 POSIX兼容语法"
     TARGET_FEATURES = {"variable_assignment_append"}
+    TRIGGER_PATTERN = r"\+=|declare"
     
     # Added declaration_command to target node types to handle declare -i
     target_node_types = ["variable_assignment", "declaration_command"]
@@ -31,7 +32,7 @@ class VariableAssignmentMutator(BaseMutator):
         patches = []
         
         # Parse AST
-        ast = self.parser.parse(bytes(source_code, "utf8"))
+        ast = self.parse(source_code, context)
         root = ast.root_node
         
         # Traverse AST and collect all target nodes
@@ -98,7 +99,7 @@ class VariableAssignmentMutator(BaseMutator):
         # Check if there's a -i flag
         for i in range(1, len(node.children)):
             if node.children[i].type == 'word':
-                word_text = source_code[node.children[i].start_byte:node.children[i].end_byte]
+                word_text = node.children[i].text.decode("utf8")
                 if word_text == '-i':
                     return True
                 
@@ -116,11 +117,11 @@ class VariableAssignmentMutator(BaseMutator):
                 
                 for assignment_child in child.children:
                     if assignment_child.type == 'variable_name':
-                        var_name = source_code[assignment_child.start_byte:assignment_child.end_byte]
+                        var_name = assignment_child.text.decode("utf8")
                     elif assignment_child.type == '=':
                         continue
                     else:
-                        var_value = source_code[assignment_child.start_byte:assignment_child.end_byte]
+                        var_value = assignment_child.text.decode("utf8")
                 
                 if var_name and var_value:
                     return f"{var_name}={var_value}"
@@ -135,7 +136,7 @@ class VariableAssignmentMutator(BaseMutator):
         """Extract variable name from assignment node"""
         for child in node.children:
             if child.type == 'variable_name':
-                return source_code[child.start_byte:child.end_byte]
+                return child.text.decode("utf8")
         return ""
     
     def _get_right_value(self, node: tree_sitter.Node, source_code: str) -> str:
@@ -153,7 +154,7 @@ class VariableAssignmentMutator(BaseMutator):
         # If we found the operator, get the next child
         if operator_index >= 0 and operator_index + 1 < len(node.children):
             value_node = node.children[operator_index + 1]
-            return source_code[value_node.start_byte:value_node.end_byte]
+            return value_node.text.decode("utf8")
         return ""
     
     def _is_string_node(self, node: tree_sitter.Node) -> bool:
@@ -2,8 +2,10 @@
 Mutator Generator module for generating code mutators using LLM
 """
 
+import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from src.llm import LLMClient
@@ -11,19 +13,45 @@ from src.prompt import PromptEngine
 
 logger = logging.getLogger(__name__)
 
+# a ``` fence line (opening or closing) of the response, with its optional language tag
+CODE_FENCE_PATTERN = re.compile(r"^```[ \t]*([\w+-]*)[ \t]*$", re.MULTILINE)
+PYTHON_FENCE_TAGS = ("python", "py")
+
+def _extract_code(response: str) -> str:
+    """
+    Mutator code of a response: its first ```python fenced block, or if there is none its first
+    untagged fenced block, or the whole response if there is no such block.
+    Fence lines are paired in order, so the closing fence of a block never opens another one.
+    """
+    fences = list(CODE_FENCE_PATTERN.finditer(response))
+    untagged_code = None
+    for opening, closing in zip(fences[0::2], fences[1::2]):
+        tag = opening.group(1).lower()
+        code = response[opening.end() + 1:closing.start()]
+        if tag in PYTHON_FENCE_TAGS:
+            return code.strip()
+        if not tag and untagged_code is None:
+            untagged_code = code
+    return untagged_code.strip() if untagged_code is not None else response.strip()
+
 class MutatorGenerator:
     """Generates code mutators using LLM"""
     
-    def __init__(self, llm_client_config: Dict[str, Any], prompt_engine_config: Dict[str, Any]):
+    def __init__(self, llm_client_config: Dict[str, Any], prompt_engine_config: Dict[str, Any],
+                 cache_config: Optional[Dict[str, Any]] = None):
         """
         Initialize the mutator generator
         
         Args:
             llm_client: LLM client for API calls
             prompt_engine_config: Configuration for the prompt engine
+            cache_config: Configuration for the LLM response cache
         """
-        self.llm_client = LLMClient(llm_client_config)
+        self.llm_client = LLMClient(llm_client_config, cache_config)
         self.prompt_engine = PromptEngine(prompt_engine_config)
+        # the static system prompt goes first, so every request shares the same cacheable prefix
+        self.system_prompt = self.prompt_engine.generate_system_prompt()
+        self.llm_client.set_system_prompt(self.system_prompt)
         
     def generate_mutator(self, feature: str) -> str:
         """
@@ -38,10 +66,50 @@ class MutatorGenerator:
         # Generate prompt using your existing prompt engine
         prompt = self.prompt_engine.generate_mutator_prompt(feature=feature)
         # Generate the mutator code
-        mutator_code = self.llm_client.generate_response(prompt)
+        mutator_code = _extract_code(self.llm_client.generate_response(prompt))
         
         return mutator_code
         
+    def generate_mutators_batch(self, features: List[str]) -> Dict[str, str]:
+        """
+        Generate the mutators of several shell features with a single LLM request
+        
+        Args:
+            features: The shell feature names
+        Returns:
+            Dictionary of feature -> generated mutator code, features missing from
+            the response (or an unparsable response) are left out
+        """
+        logger.info(f"Generating mutators for features: {features}")
+        prompt = self.prompt_engine.generate_batch_prompt(features)
+        response = self.llm_client.generate_response(prompt)
+        mutator_codes = self._parse_batch_response(response)
+        return {
+            feature: _extract_code(mutator_codes[feature]) for feature in features
+            if isinstance(mutator_codes.get(feature), str) and mutator_codes[feature].strip()
+        }
+
+    def _parse_batch_response(self, response: str) -> Dict[str, Any]:
+        """
+        Parse the JSON object (feature -> code) out of a batch response: the first { where a JSON object
+        can be decoded. The decoder finds the end of the object itself, so fences inside the code 
+        values (```python) don't cut it short, and a ```json fence or text around it is skipped.
+        """
+        decoder = json.JSONDecoder()
+        start = response.find("{")
+        error = None
+        while start != -1:
+            try:
+                mutator_codes, _ = decoder.raw_decode(response, start)
+            except ValueError as e:
+                error = error or e
+            else:
+                if isinstance(mutator_codes, dict):
+                    return mutator_codes
+            start = response.find("{", start + 1)
+        logger.warning(f"Failed to parse batch response as JSON: {str(error) if error else 'no JSON object found'}")
+        return {}
+
     def refine_mutator(self, feature: str, feedback: str, previous_code: str) -> str:
         """
         Refine a mutator based on validation feedback
@@ -65,14 +133,20 @@ class MutatorGenerator:
         )
         
         # Generate refined code
-        refined_code = self.llm_client.generate_response(refinement_prompt)
+        refined_code = _extract_code(self.llm_client.generate_response(refinement_prompt))
         
         return refined_code
 
-    def save_mutator(mutator_code, feature, output_dir):
+    def save_mutator(self, mutator_code, feature, output_dir):
         """Save a validated mutator to file"""
         output_file = Path(output_dir) / f"{feature}_mutator.py"
         output_file.write_text(mutator_code)
 
     def clear_history(self):
         self.llm_client.clear_history()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return self.llm_client.cache.get_stats()
+
+    def get_token_usage(self) -> Dict[str, int]:
+        return self.llm_client.get_token_usage()
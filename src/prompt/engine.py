@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 from string import Template
 from src.utils import initialize_parser
 
@@ -16,6 +16,10 @@ class PromptEngine:
         self.template               = self._load_templates(self.template_path)
         self.refinement_path        = Path(config.get("template_dir")) / "refinement.tpl"
         self.refinement_template    = self._load_templates(self.refinement_path)
+        self.system_path            = Path(config.get("template_dir")) / "system.tpl"
+        self.system_template        = self._load_templates(self.system_path)
+        self.batch_path             = Path(config.get("template_dir")) / "batch.tpl"
+        self.batch_template         = self._load_templates(self.batch_path)
         self.docs_dir               = Path(config.get("docs_dir"))
         self.examples_dir           = Path(config.get("examples_dir"))
 
@@ -86,6 +90,15 @@ class PromptEngine:
 
         return _format_node(tree.root_node)
 
+    def generate_system_prompt(self) -> str:
+        """
+        生成与语法特性无关的系统prompt（角色、代码要求与约束条件）
+        该前缀在所有特性与改进轮次中保持不变，便于LLM服务端的前缀缓存命中
+        Returns:
+            系统prompt字符串
+        """
+        return self.system_template.template
+
     def generate_mutator_prompt(self, feature: str) -> str:
         """
         生成用于创建mutator的prompt
@@ -104,6 +117,23 @@ class PromptEngine:
         )
         return prompt
     
+    def generate_batch_prompt(self, features: List[str]) -> str:
+        """
+        生成一次性创建多个mutator的prompt, 要求LLM以JSON对象(特性名称 -> Mutator代码)输出
+        Args:
+            features: 语法特性名称列表
+        Returns:
+            填充后的prompt字符串
+        """
+        feature_sections = "\n\n---\n\n".join(
+            f"## **特性：{feature}**\n\n{self.generate_mutator_prompt(feature)}" for feature in features
+        )
+        prompt = self.batch_template.substitute(
+            feature_names="、".join(features),
+            feature_sections=feature_sections,
+        )
+        return prompt
+
     def generate_refinement_prompt(self, feature: str, feedback: str, previous_mutator_code:str) -> str:
         """
         生成用于改进mutator的prompt
@@ -0,0 +1,11 @@
+我需要你一次性为以下多个语法特性分别编写转换器（Mutator）：$feature_names。每个特性的转换规则与输入输出示例如下，请严格按照系统提示中的代码要求和约束条件生成代码。
+
+$feature_sections
+
+---
+
+### **输出要求**
+
+- 仅输出一个JSON对象，不要输出任何其他内容。
+- JSON对象的键为特性名称（与上面的特性名称完全一致），值为该特性完整的Mutator类代码字符串。
+- 每个特性对应一个独立、完整的Mutator类，不同特性之间不要共享代码。
\ No newline at end of file
@@ -10,6 +10,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -27,6 +32,11 @@ class TestReporter:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # all round reports are appended to a single JSONL file, opened on first use
+        self.jsonl_path = self.output_dir / "reports.jsonl"
+        self._fp = None
+        # counters of the round being streamed, see add_testcase_result
+        self._round = None
         self.all_rounds_summary = {
             "rounds": 0,
             "total_tests": 0,
@@ -66,38 +76,40 @@ class TestReporter:
         except Exception:
             return []
 
-    def _generate_results_summary(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _new_round(self, round_num: int) -> Dict[str, Any]:
+        """State of the round being streamed, only counters and the names of failed testcases are kept"""
+        return {
+            "round_num": round_num,
+            "total_tests": 0,
+            "passed": 0,
+            "failed": 0,
+            "warnings": 0,
+            "errors": 0,
+            "warning_testcases": [],
+            "failure_testcases": [],
+        }
+
+    def _generate_results_summary(self, round_state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Generate a summary of test results
+        Generate a summary of the test results of a round
         
         Args:
-            results: List of testcase result, each is a dictionary with:
-                - seed_name: Name of the test seed
-                - test_count: int
-                - pass_num: int
-                - fail_num: int
-                - waring_num: int
-                - details: List of dictionaries with detail for each test input
-            or  
-                - seed_name: Name of the test seed
-                - tool_error: str(e)
+            round_state: Counters of the round, see _new_round
         Returns:
             Summary dictionary
         """
-        total   = sum(r.get("test_count", 0) for r in results)
-        passed  = sum(r.get("pass_num", 0) for r in results)
-        failed  = sum(r.get("fail_num", 0) for r in results)
-        warnings= sum(r.get("warning_num", 0) for r in results)
-        errors  = sum(r.get("tool_error", 0) for r in results)
+        total = round_state["total_tests"]
+        passed = round_state["passed"]
+        warnings = round_state["warnings"]
         effective_rate = ((passed + warnings) / total * 100) if total > 0 else 0
         success_rate = (passed / total * 100) if total > 0 else 0
         
         return {
             "total_tests": total,
             "passed": passed,
-            "failed": failed,
+            "failed": round_state["failed"],
             "warnings": warnings,
-            "errors": errors,
+            "errors": round_state["errors"],
             "effective_rate": f"{effective_rate:.2f}%",
             "success_rate": f"{success_rate:.2f}%",
         }
@@ -115,64 +127,6 @@ class TestReporter:
         logger.debug(f"JSON report saved to: {file_path}")
         return str(file_path)
         
-    def _generate_report(self,
-                        metadata: Optional[Dict[str, Any]] = None,
-                        results: List[Dict[str, Any]] = []) -> Dict[str, Any]:
-        """
-        Generate a structured test report from test results
-        
-        Args:
-            metadata: Additional metadata to include in the report
-            results: List of testcase result from this round (each testcase result struct see tester.py)
-            
-        Returns:
-            Dictionary containing the structured report
-        """
-        # Generate summary statistics
-        summary = self._generate_results_summary(results)
-        
-        warning_analysis = [] 
-        failure_analysis = []
-        for testcase_result in results:
-            seed_name = testcase_result.get("seed_name", "unknown_seed")
-            test_count = testcase_result.get("test_count", 0)
-            pass_num = testcase_result.get("pass_num", 0)
-            
-            if pass_num == test_count:
-                continue  # Testcase passed
-
-            if testcase_result.get("tool_error"):
-                failure_analysis.append({"seed_name": seed_name, "error": testcase_result["tool_error"]})
-                continue # Testcase Tool error
-
-            warning_num = testcase_result.get("warning_num", 0)
-            failure_num = testcase_result.get("fail_num", 0)
-            if warning_num > 0:
-                warning_analysis.append({
-                    "seed_name": seed_name,
-                    "warnings_num": warning_num,
-                })
-            if failure_num > 0:
-                failure_analysis.append({
-                    "seed_name": seed_name,
-                    "failures_num": failure_num,
-                })
-        
-        # Build the report
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        report = {
-            "timestamp": timestamp,
-            "summary": summary,
-            "warning_testcases": warning_analysis,
-            "failure_testcases": failure_analysis,
-            "result_details_of_testcases": results,
-        }
-        
-        if metadata:
-            report["metadata"] = metadata
-            
-        return report
-        
     def _save_report(self, 
                     report: Dict[str, Any], 
                     file_format: str = "json", 
@@ -197,30 +151,113 @@ class TestReporter:
         else:
             raise ValueError(f"Unsupported report format: {file_format}")
     
-    def generate_round_report(self, round_num: int, round_results: list) -> Dict[str, Any]:
+    def _dumps_line(self, record: Dict[str, Any]) -> bytes:
+        """Serialize a record as one compact JSONL line"""
+        if orjson is not None:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def _loads_line(self, line: bytes) -> Dict[str, Any]:
+        """Deserialize one JSONL line"""
+        if orjson is not None:
+            return orjson.loads(line)
+        return json.loads(line)
+
+    def open_jsonl(self, path: Optional[str] = None):
         """
-        process the test results of a round and generate a report
+        Open the append-only JSONL file which round reports are written to
+        
+        Args:
+            path: Optional custom path, default is <output_dir>/reports.jsonl
+        """
+        self.close()
+        if path is not None:
+            self.jsonl_path = Path(path)
+        self._fp = open(self.jsonl_path, "ab", buffering=1 << 20)
+
+    def close(self):
+        """Flush and close the JSONL report file"""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    @property
+    def round_pending(self) -> bool:
+        """Whether testcase results have been added since the last finished round"""
+        return self._round is not None
+
+    def add_testcase_result(self, round_num: int, testcase_result: Dict[str, Any]) -> None:
+        """
+        Append one testcase result to the JSONL report right away and count it into the round,
+        so the results of a round never have to be held in memory
+        
+        Args:
+            round_num: Current round number
+            testcase_result: Testcase result, a dictionary with:
+                - seed_name: Name of the test seed
+                - test_count: int
+                - pass_num: int
+                - fail_num: int
+                - warning_num: int
+                - details: List of dictionaries with detail for each test input
+            or  
+                - seed_name: Name of the test seed
+                - tool_error: str(e)
+        """
+        if self._round is None:
+            self._round = self._new_round(round_num)
+        round_state = self._round
+
+        seed_name = testcase_result.get("seed_name", "unknown_seed")
+        test_count = testcase_result.get("test_count", 0)
+        pass_num = testcase_result.get("pass_num", 0)
+        warning_num = testcase_result.get("warning_num", 0)
+        failure_num = testcase_result.get("fail_num", 0)
+        round_state["total_tests"] += test_count
+        round_state["passed"] += pass_num
+        round_state["failed"] += failure_num
+        round_state["warnings"] += warning_num
+
+        if "tool_error" in testcase_result:
+            round_state["errors"] += 1
+        if pass_num != test_count:
+            if testcase_result.get("tool_error"):
+                # Testcase Tool error
+                round_state["failure_testcases"].append({"seed_name": seed_name, "error": testcase_result["tool_error"]})
+            else:
+                if warning_num > 0:
+                    round_state["warning_testcases"].append({
+                        "seed_name": seed_name,
+                        "warnings_num": warning_num,
+                    })
+                if failure_num > 0:
+                    round_state["failure_testcases"].append({
+                        "seed_name": seed_name,
+                        "failures_num": failure_num,
+                    })
+
+        try:
+            if self._fp is None:
+                self.open_jsonl()
+            self._fp.write(self._dumps_line({"type": "testcase", "round_num": round_num, "result": testcase_result}))
+        except Exception as e:
+            logger.error(f"Error saving testcase {seed_name} of round {round_num}: {str(e)}")
+
+    def finish_round(self, round_num: int) -> Dict[str, Any]:
+        """
+        Close the round: append its summary record to the JSONL report and update the global summary
         
         Args:
             round_num: Current round number
-            round_results: List of testcase result from this round (each testcase result struct see tester.py)
-            config: Configuration dictionary
-            seed_files: List of test seed files
 
         Returns:
             Summary of the round report
         """
-        
-        # generate round report
-        report = self._generate_report(
-            metadata={
-                "round_num": round_num,
-            },
-            results=round_results
-        )
+        round_state = self._round or self._new_round(round_num)
+        self._round = None
+        summary = self._generate_results_summary(round_state)
         
         # update global summary
-        summary = report["summary"]
         self.all_rounds_summary["rounds"] = max(self.all_rounds_summary["rounds"], round_num) # idiot code ^^
         self.all_rounds_summary["total_tests"] += summary["total_tests"]
         self.all_rounds_summary["passed"] += summary["passed"]
@@ -228,16 +265,41 @@ class TestReporter:
         self.all_rounds_summary["warnings"] += summary["warnings"]
         self.all_rounds_summary["errors"] += summary["errors"]
         
-        # save round report
-        saved_files = {}
-        file_format = "json"  # default format
+        # append the round summary record after the testcase lines of the round
         try:
-            filename = f"round_{round_num}_report"
-            saved_files[file_format] = self._save_report(report, file_format, filename)
+            if self._fp is None:
+                self.open_jsonl()
+            round_record = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "summary": summary,
+                "warning_testcases": round_state["warning_testcases"],
+                "failure_testcases": round_state["failure_testcases"],
+                "metadata": {"round_num": round_num},
+                "type": "round_summary",
+                "round_num": round_num,
+            }
+            self._fp.write(self._dumps_line(round_record))
+            self._fp.flush()
         except Exception as e:
-            logger.error(f"Error saving {file_format} report: {str(e)}")
+            logger.error(f"Error saving round {round_num} report: {str(e)}")
         
         return summary
+
+    def generate_round_report(self, round_num: int, round_results: list) -> Dict[str, Any]:
+        """
+        process the test results of a round and generate a report,
+        same as add_testcase_result for each result followed by finish_round
+        
+        Args:
+            round_num: Current round number
+            round_results: List of testcase result from this round (each testcase result struct see tester.py)
+
+        Returns:
+            Summary of the round report
+        """
+        for testcase_result in round_results:
+            self.add_testcase_result(round_num, testcase_result)
+        return self.finish_round(round_num)
     
     def generate_summary_report(self, config: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
@@ -319,24 +381,32 @@ class TestReporter:
 
     def collect_failure_reports(self) -> str:
         """
-        Collect and summarize all failure reports from round files
+        Collect and summarize all failure reports from the JSONL report file
         """
-        all_failures = []
-        round_files = sorted(list(self.output_dir.glob("round_*_report.json")))
-        
-        for report_file in round_files:
-            try:
-                with open(report_file, 'r') as f:
-                    report_data = json.load(f)
-                    
-                round_num = report_data.get("metadata", {}).get("round_num", "unknown")
-                
-                failures = []
-                for result in report_data.get("result_details_of_testcases", []):
+        if self._fp is not None:
+            self._fp.flush()
+
+        round_nums = []
+        round_failures: Dict[Any, List[Dict[str, Any]]] = {}
+        if self.jsonl_path.exists():
+            with open(self.jsonl_path, "rb") as f:
+                for line_num, line in enumerate(f, 1):
+                    try:
+                        record = self._loads_line(line)
+                    except ValueError as e:
+                        logger.error(f"Error processing line {line_num} of {self.jsonl_path}: {str(e)}")
+                        continue
+
+                    round_num = record.get("round_num", "unknown")
+                    if record.get("type") == "round_summary":
+                        round_nums.append(round_num)
+                        continue
+
+                    result = record.get("result", {})
                     seed_name = result.get("seed_name", "unknown_seed")
                     
                     if "tool_error" in result:
-                        failures.append({
+                        round_failures.setdefault(round_num, []).append({
                             "seed_name": seed_name,
                             "error_type": "tool_error",
                             "error": result["tool_error"]
@@ -350,23 +420,19 @@ class TestReporter:
                             if detail.get("status") == "FAILURE":
                                 failure_details.append(detail)                        
                         
-                        failures.append({
+                        round_failures.setdefault(round_num, []).append({
                             "seed_name": seed_name,
                             "failure_count": fail_num,
                             "details": failure_details
                         })
-                
-                if failures:
-                    all_failures.append({
-                        "round": round_num,
-                        "failures": failures
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error processing report file {report_file}: {str(e)}")
+
+        all_failures = [
+            {"round": round_num, "failures": round_failures[round_num]}
+            for round_num in round_nums if round_num in round_failures
+        ]
         
         summary_report = {
-            "total_rounds_analyzed": len(round_files),
+            "total_rounds_analyzed": len(round_nums),
             "rounds_with_failures": len(all_failures),
             "failure_details": all_failures
         }
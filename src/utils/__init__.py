@@ -3,13 +3,20 @@ Utils package
 """
 
 from .config_loader import load_config
-from .shell import execute_shell_command
-from .seedgen import generate_seed_scripts
+from .shell import execute_shell_command, execute_shell_command_async
+from .seedgen import generate_seed_scripts, iter_seed_scripts
 from .parser import initialize_parser
+from .fileio import read_file_bytes, write_file_bytes
+from .lru_cache import LRUCache
 
 __all__ = [
     "load_config",
     "execute_shell_command",
+    "execute_shell_command_async",
     "generate_seed_scripts",
-    "initialize_parser"
+    "iter_seed_scripts",
+    "initialize_parser",
+    "read_file_bytes",
+    "write_file_bytes",
+    "LRUCache",
 ]
\ No newline at end of file
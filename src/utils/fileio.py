@@ -0,0 +1,42 @@
+"""
+Raw file IO helpers for the many small seed and POSIX scripts
+"""
+
+import os
+from typing import Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+_READ_CHUNK_SIZE = 1 << 20
+
+
+def read_file_bytes(path: PathLike) -> bytes:
+    """
+    Read a whole file as bytes with plain os.open/os.read, no text decoding
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, _READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def write_file_bytes(path: PathLike, data: bytes, mode: int = 0o644, dir_fd: Optional[int] = None) -> None:
+    """
+    Create or truncate a file and write the bytes with plain os.open/os.write,
+    if dir_fd is given, a relative path is resolved against that open directory (openat)
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
@@ -1,14 +1,27 @@
 import os
+import threading
 import tree_sitter
 
+# the bash grammar is built and loaded once per process, Language objects can be shared
+_bash_language = None
+_bash_language_lock = threading.Lock()
+
+def _get_bash_language() -> tree_sitter.Language:
+    global _bash_language
+    with _bash_language_lock:
+        if _bash_language is None:
+            tree_sitter_bash_path = os.path.join(os.getcwd(), 'tree-sitter-bash')
+            # only recompiles when the grammar sources are newer than the library
+            tree_sitter.Language.build_library(
+                'build/my-languages.so',
+                [tree_sitter_bash_path]
+            )
+            _bash_language = tree_sitter.Language('build/my-languages.so', 'bash')
+        return _bash_language
+
 # Initialize tree-sitter parser
 def initialize_parser():
-    tree_sitter_bash_path = os.path.join(os.getcwd(), 'tree-sitter-bash')
-    tree_sitter.Language.build_library(
-        'build/my-languages.so',
-        [tree_sitter_bash_path]
-    )
-    BASH_LANGUAGE = tree_sitter.Language('build/my-languages.so', 'bash')
+    """A new parser (parsers are not thread-safe) for the shared bash language"""
     parser = tree_sitter.Parser()
-    parser.set_language(BASH_LANGUAGE)
+    parser.set_language(_get_bash_language())
     return parser
\ No newline at end of file
@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Iterator
+import os
 import shutil
 import subprocess
 import logging
@@ -9,6 +11,16 @@ def generate_seed_scripts(seedgen_path: str, seed_dir: Path, seed_count: int = 1
     """
     Generates a random bash scripts seeds.
     """
+    for _ in iter_seed_scripts(seedgen_path, seed_dir, seed_count, seed_depth):
+        pass
+
+
+def iter_seed_scripts(seedgen_path: str, seed_dir: Path, seed_count: int = 10, seed_depth: int = 100) -> Iterator[str]:
+    """
+    Generates a random bash scripts seeds, 
+    yields the path of each seed (in name order) as soon as it is formatted and moved into <seed_dir>,
+    so that consumers can start testing while the rest are still being formatted.
+    """
     seed_dir.mkdir(parents=True, exist_ok=True)
     subdir_seeds = seed_dir / "seeds"
     subdir_trees = seed_dir / "trees"
@@ -24,26 +36,30 @@ def generate_seed_scripts(seedgen_path: str, seed_dir: Path, seed_count: int = 1
         logger.error(f"Error generating seeds: {e}") 
         return
 
-    # move files from <seed_dir>/seeds to <seed_dir>
-    if subdir_seeds.exists() and subdir_seeds.is_dir():
-        for seed_file in subdir_seeds.iterdir():
-            # shfmt the seed file
-            if seed_file.is_file():
+    try:
+        # move files from <seed_dir>/seeds to <seed_dir>
+        if subdir_seeds.is_dir():
+            with os.scandir(subdir_seeds) as it:
+                seed_names = sorted(entry.name for entry in it if entry.is_file(follow_symlinks=False))
+            for seed_name in seed_names:
+                # shfmt the seed file
+                seed_file = os.path.join(subdir_seeds, seed_name)
                 try:
                     subprocess.run([
-                        "shfmt", "-w", str(seed_file)], 
+                        "shfmt", "-w", seed_file], 
                         stdout=subprocess.DEVNULL,
                         stderr=subprocess.DEVNULL,
                         check=True
                     ),
-                    shutil.move(str(seed_file), str(seed_dir))
+                    shutil.move(seed_file, str(seed_dir))
                 except subprocess.CalledProcessError as e:
-                    seed_file.unlink()
+                    os.unlink(seed_file)
                     continue
-
-    # remove the <seed_dir>/seeds and <seed_dir>/trees
-    for subdir in [subdir_seeds, subdir_trees]:
-        if subdir.exists() and subdir.is_dir():
-            shutil.rmtree(subdir)
+                yield os.path.join(seed_dir, seed_name)
+    finally:
+        # remove the <seed_dir>/seeds and <seed_dir>/trees
+        for subdir in [subdir_seeds, subdir_trees]:
+            if subdir.exists() and subdir.is_dir():
+                shutil.rmtree(subdir)
     
     # now remains only the <seed_dir> with the generated seeds
\ No newline at end of file
@@ -2,71 +2,218 @@
 Shell utilities for executing shell commands
 """
 
+import asyncio
 import logging
 import os
+import resource
+import signal
 import subprocess
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 
 logger = logging.getLogger(__name__)
 
+
+def _cpu_limiter(cpu_limit: Optional[int]) -> Optional[Callable[[], None]]:
+    """preexec_fn setting RLIMIT_CPU, so a CPU hog gets SIGXCPU even if it escapes the timeout"""
+    if cpu_limit is None:
+        return None
+
+    def _set_limit():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    return _set_limit
+
+
+def _kill_group(process) -> None:
+    """Kill the process and all the children it spawned, the process leads its own session"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def _communicate_limited(process, input_bytes: Optional[bytes], max_output_bytes: int):
+    """
+    process.communicate() that stops reading once stdout or stderr exceeds max_output_bytes,
+    the process group is then killed. Returns (stdout, stderr), or None if the limit was exceeded
+    """
+    exceeded = False
+
+    async def feed():
+        if input_bytes is None:
+            return
+        try:
+            process.stdin.write(input_bytes)
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        process.stdin.close()
+
+    async def read(stream) -> bytes:
+        nonlocal exceeded
+        chunks, size = [], 0
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                return b"".join(chunks)
+            size += len(chunk)
+            if size > max_output_bytes and not exceeded:
+                # the other stream reaches EOF as soon as the group is gone
+                exceeded = True
+                _kill_group(process)
+            if not exceeded:
+                chunks.append(chunk)
+
+    _, stdout, stderr = await asyncio.gather(feed(), read(process.stdout), read(process.stderr))
+    await process.wait()
+    return None if exceeded else (stdout, stderr)
+
+
 def execute_shell_command(
     command: List[str],
     input_text: Optional[str] = None,
     timeout: int = 5,
-    env: Optional[Dict[str, str]] = None
+    env: Optional[Dict[str, str]] = None,
+    cpu_limit: Optional[int] = None
 ) -> Dict:
     """
-    Execute a shell command and return the results
+    Execute a shell command and return the results,
+    the command runs in its own process group which is killed as a whole on timeout
     
     Args:
         command: List of command arguments
         input_text: Optional input text to provide to the command
         timeout: Timeout in seconds
         env: Optional environment variables
+        cpu_limit: Optional CPU time limit (RLIMIT_CPU) in seconds
         
     Returns:
         Dictionary with stdout, stderr, and return code
     """
-    logger.debug(f"Executing command: {' '.join(command)}")
+    logger.debug("Executing command: %s", command)
     
     input_bytes = None
     if input_text is not None:
         input_bytes = input_text.encode('utf-8')
     
     try:
-        process = subprocess.run(
+        process = subprocess.Popen(
             command,
-            input=input_bytes,
-            timeout=timeout,
+            stdin=subprocess.PIPE if input_bytes is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             env=env,
-            capture_output=True,
-            text=False  # We'll decode manually to handle errors better, use bytes
+            start_new_session=True,
+            preexec_fn=_cpu_limiter(cpu_limit)
         )
         
-        # Decode stdout and stderr, replacing invalid characters
-        stdout = process.stdout.decode('utf-8', errors='replace')
-        stderr = process.stderr.decode('utf-8', errors='replace')
+        try:
+            # We'll decode manually to handle errors better, use bytes
+            stdout, stderr = process.communicate(input_bytes, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # logger.warning(f"Command timed out after {timeout} seconds: {' '.join(command)}")
+            _kill_group(process)
+            process.communicate()
+            return {
+                "stdout": "",
+                "stderr": f"Command timed out after {timeout} seconds",
+                "exitcode": -1
+            }
         
+        # Decode stdout and stderr, replacing invalid characters
         result = {
-            "stdout": stdout,
-            "stderr": stderr,
+            "stdout": stdout.decode('utf-8', errors='replace'),
+            "stderr": stderr.decode('utf-8', errors='replace'),
             "exitcode": process.returncode
         }
         
-        logger.debug(f"Command completed with return code {process.returncode}")
+        logger.debug("Command completed with return code %s", process.returncode)
         return result
         
-    except subprocess.TimeoutExpired:
-        # logger.warning(f"Command timed out after {timeout} seconds: {' '.join(command)}")
+    except Exception as e:
+        logger.error(f"Error executing command: {str(e)}")
         return {
             "stdout": "",
-            "stderr": f"Command timed out after {timeout} seconds",
+            "stderr": f"Error: {str(e)}",
             "exitcode": -1
         }
+
+
+async def execute_shell_command_async(
+    command: List[str],
+    input_text: Optional[str] = None,
+    timeout: int = 5,
+    env: Optional[Dict[str, str]] = None,
+    cpu_limit: Optional[int] = None,
+    decode: bool = True,
+    max_output_bytes: int = 0
+) -> Dict:
+    """
+    Execute a shell command asynchronously and return the results,
+    same as execute_shell_command but lets several commands run concurrently
+    
+    Args:
+        command: List of command arguments
+        input_text: Optional input text to provide to the command
+        timeout: Timeout in seconds
+        env: Optional environment variables
+        cpu_limit: Optional CPU time limit (RLIMIT_CPU) in seconds
+        decode: Decode stdout and stderr, otherwise the raw bytes of a completed command are returned
+        max_output_bytes: Kill the command as soon as its stdout or stderr exceeds this size, 0 means no limit
+        
+    Returns:
+        Dictionary with stdout, stderr, and return code
+    """
+    logger.debug("Executing command: %s", command)
+    
+    input_bytes = None
+    if input_text is not None:
+        input_bytes = input_text.encode('utf-8')
+    
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if input_bytes is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            start_new_session=True,
+            preexec_fn=_cpu_limiter(cpu_limit)
+        )
+        
+        try:
+            if max_output_bytes > 0:
+                outputs = await asyncio.wait_for(_communicate_limited(process, input_bytes, max_output_bytes), timeout)
+                if outputs is None:
+                    return {
+                        "stdout": "",
+                        "stderr": f"Command output exceeded {max_output_bytes} bytes",
+                        "exitcode": -1
+                    }
+                stdout, stderr = outputs
+            else:
+                stdout, stderr = await asyncio.wait_for(process.communicate(input_bytes), timeout)
+        except asyncio.TimeoutError:
+            _kill_group(process)
+            await process.wait()
+            return {
+                "stdout": "",
+                "stderr": f"Command timed out after {timeout} seconds",
+                "exitcode": -1
+            }
+        
+        logger.debug("Command completed with return code %s", process.returncode)
+        if not decode:
+            return {"stdout": stdout, "stderr": stderr, "exitcode": process.returncode}
+        return {
+            "stdout": stdout.decode('utf-8', errors='replace'),
+            "stderr": stderr.decode('utf-8', errors='replace'),
+            "exitcode": process.returncode
+        }
+        
     except Exception as e:
         logger.error(f"Error executing command: {str(e)}")
         return {
             "stdout": "",
             "stderr": f"Error: {str(e)}",
             "exitcode": -1
-        }
\ No newline at end of file
+        }